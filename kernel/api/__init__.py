@@ -7,8 +7,11 @@ from sympy.parsing.latex import parse_latex
 
 from extension.util import DICT
 from gamma.logic import SymPyGamma
+from gamma.utils import LatexCache, latex_cache
 from nlp import translate
 
+last_latex_cache = LatexCache()
+
 
 def catch(func: Callable) -> Callable:
     def closure(*args):
@@ -19,7 +22,18 @@ def catch(func: Callable) -> Callable:
     return closure
 
 
+def cache_latex(func: Callable) -> Callable:
+    """Render each expression to LaTeX at most once per request."""
+    def closure(*args):
+        global last_latex_cache
+        with latex_cache() as cache:
+            last_latex_cache = cache
+            return func(*args)
+    return closure
+
+
 @catch
+@cache_latex
 def eval_input(raw_input: str, variable: str | None = None):
     try:
         return SymPyGamma(raw_input, variable).eval()
@@ -85,9 +99,14 @@ def eval_latex_input(raw_input: str):
 
 
 @catch
+@cache_latex
 def eval_card(card_name: str, expression: str, variable: str | None, parameters: DICT | None):
     return SymPyGamma(expression, variable).eval_card(card_name, parameters)
 
 
 def get_sympy_version() -> str:
     return __version__
+
+
+def get_latex_cache_stats() -> DICT:
+    return last_latex_cache.stats()
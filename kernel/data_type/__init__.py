@@ -108,7 +108,8 @@ class _ContinuedFraction(Dict):
     n: int
     finite: list[int]
     repeated: list[int] | None
+    truncated: bool
 
 
-def ContinuedFraction(n: int, finite: list[int], repeated: list[int] | None):
-    return _ContinuedFraction(type='ContinuedFraction', n=n, finite=finite, repeated=repeated)
+def ContinuedFraction(n: int, finite: list[int], repeated: list[int] | None, truncated: bool = False):
+    return _ContinuedFraction(type='ContinuedFraction', n=n, finite=finite, repeated=repeated, truncated=truncated)
@@ -1,19 +1,27 @@
-import numpy as np
 from sympy import Integer
 
-from extension.util import DICT, format_latex, take_int_input
+from extension.util import DICT, format_latex
 from gamma.result_card import ResultCard
+from gamma.utils import (LONG_INTEGER_DIGITS, count_digits, format_long_integer, int_to_base, leading_digits,
+                         trailing_digits)
 
 
-def not_too_big(components: DICT) -> bool:
+def is_natural(components: DICT) -> bool:
     n = components['input_evaluated']
-    return isinstance(n, Integer) and 0 <= n <= np.iinfo(np.uint64).max
+    return isinstance(n, Integer) and n >= 0
 
 
-@take_int_input
-def binary_form(n: int) -> str:
-    return np.base_repr(n) + '_2'
+def base_form(components: DICT, parameters: DICT | None = None) -> str:
+    n = int(components['input_evaluated'])
+    base = int((parameters or {}).get('base', 2))
+    subscript = f'_{base}' if base < 10 else f'_{{{base}}}'
+    count = count_digits(n, base)
+    if count <= LONG_INTEGER_DIGITS:
+        return int_to_base(n, base) + subscript
+    return int_to_base(leading_digits(n, 20, base), base) + R'\ldots ' + trailing_digits(n, 21, base) + subscript\
+        + R'\ (' + str(count) + R'\text{ digits})'
 
 
-binary_form_card = ResultCard("Binary form", "np.base_repr(%s)", eval_method=binary_form, wiki='Binary_number',
-                              format_output=format_latex, applicable=not_too_big)
+binary_form_card = ResultCard("Binary form", "np.base_repr(%s)", eval_method=base_form, wiki='Binary_number',
+                              format_input=format_long_integer, format_output=format_latex, applicable=is_natural,
+                              parameters=['base'])
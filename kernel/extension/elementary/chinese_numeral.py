@@ -1,79 +1,83 @@
-from sympy import Integer
-
 from data_type import ChineseNumeral
-from extension.util import DICT, take_int_input
+from extension.elementary.util import digit_groups, numeral_applicable
+from extension.util import take_int_input
 from gamma.result_card import ResultCard
 
 normal_chars = ['〇', '一', '二', '三', '四', '五', '六', '七', '八', '九', '十']
-normal_units = ['百', '千', '万', '亿']
+normal_units = ['十', '百', '千']
 financial_chars = ['零', '壹', '贰', '叁', '肆', '伍', '陆', '柒', '捌', '玖', '拾']
-financial_units = ['佰', '仟', '萬', '億']
+financial_units = ['拾', '佰', '仟']
+# myriad scale, 10^4 apart
+normal_large_units = ['', '万', '亿', '兆', '京', '垓', '秭', '穰', '沟', '涧', '正', '载']
+financial_large_units = ['', '萬', '億', '兆', '京', '垓', '秭', '穰', '溝', '澗', '正', '載']
+# below it, 万 and 亿 compound as in 一万亿, since 兆 also reads as 10^6
+COMPOUND_MAX = 10 ** 16
+normal_compound_units = ['', '万', '亿']
+financial_compound_units = ['', '萬', '億']
 
-MAX = 9999999999999999
 
+def group_numeral(g: int, chars: list[str], units: list[str]) -> str:
+    """0 < g < 10000 with a zero for every gap, but not for leading or trailing zeros."""
+    buffer = []
+    zero = False
+    for position in range(3, -1, -1):
+        digit = g // 10 ** position % 10
+        if not digit:
+            zero = zero or bool(buffer)
+            continue
+        if zero:
+            buffer.append(chars[0])
+            zero = False
+        buffer.append(chars[digit])
+        if position:
+            buffer.append(units[position - 1])
+    return ''.join(buffer)
 
-def not_too_big(components: DICT) -> bool:
-    n = components['input_evaluated']
-    return isinstance(n, Integer) and 0 <= n <= MAX
 
+normal_groups = [''] + [group_numeral(g, normal_chars, normal_units) for g in range(1, 10000)]
+financial_groups = [''] + [group_numeral(g, financial_chars, financial_units) for g in range(1, 10000)]
 
-def int_to_normal(n: int) -> str:
-    def tens(t: int) -> str:
-        return normal_chars[1] if 10 <= t <= 19 else ''
 
-    if n <= 10:
-        return normal_chars[n]
-    if n <= 19:
-        return normal_chars[10] + normal_chars[n - 10]
-    if n <= 99:
-        shi, ge = divmod(n, 10)
-        return normal_chars[shi] + normal_chars[10] + (normal_chars[ge] if ge else '')
-    if n <= 999:
-        bai, shis = divmod(n, 100)
-        leading = normal_chars[bai] + normal_units[0]
-        if shis == 0:
-            return leading
-        if shis <= 9:
-            leading += normal_chars[0]
+def int_to_numeral(n: int, chars: list[str], groups: list[str], large_units: list[str]) -> str:
+    """
+    Groups of 4 digits with the large units. Past the last unit, the number
+    reads as (higher part)载(lower 44 digits), recursively, so that every 载
+    is written once; with the compound units, 亿 closes every 2 groups alike.
+    """
+    if n == 0:
+        return chars[0]
+    values = digit_groups(n, 4)
+    block = len(large_units) - 1
+    buffer = []
+    zero = False
+    for i, g in enumerate(values):
+        position = len(values) - 1 - i
+        if g:
+            if buffer and (zero or g < 1000):
+                buffer.append(chars[0])
+            zero = False
+            buffer.append(groups[g])
+            buffer.append(large_units[position % block])
         else:
-            leading += tens(shis)
-        return leading + int_to_normal(shis)
-    if n <= 9999:
-        qian, bais = divmod(n, 1000)
-        lead = normal_chars[qian] + normal_units[1]
-        if bais == 0:
-            return lead
-        if bais <= 99:
-            lead += normal_chars[0]
-            lead += tens(bais)
-        return lead + int_to_normal(bais)
-    if n <= 99999999:
-        wan, qians = divmod(n, 10000)
-        lead = int_to_normal(wan) + normal_units[2]
-        if qians == 0:
-            return lead
-        if qians <= 999:
-            lead += normal_chars[0]
-            lead += tens(qians)
-        return lead + int_to_normal(qians)
-    yi, wans = divmod(n, 100000000)
-    lead = int_to_normal(yi) + normal_units[3]
-    if wans == 0:
-        return lead
-    if wans <= 9999999:
-        lead += normal_chars[0]
-        lead += tens(wans // 10000)
-    return lead + int_to_normal(wans)
+            zero = zero or bool(buffer)
+        if position and position % block == 0:
+            buffer.append(large_units[-1])
+            # zeros closing the higher part are not a gap
+            zero = False
+    return ''.join(buffer)
+
+
+def int_to_normal(n: int) -> str:
+    large_units = normal_compound_units if n < COMPOUND_MAX else normal_large_units
+    normal = int_to_numeral(n, normal_chars, normal_groups, large_units)
+    # 十 rather than 一十 at the start
+    return normal[1:] if normal.startswith(normal_chars[1] + normal_chars[10]) else normal
 
 
 @take_int_input
 def int_to_chinese_numeral(n: int) -> tuple[str, str]:
-    normal = int_to_normal(n)
-    financial = financial_chars[1] if normal[0] == normal_chars[10] else ''
-    for c in normal:
-        financial += financial_units[normal_units.index(c)] if c in normal_units \
-            else financial_chars[normal_chars.index(c)]
-    return normal, financial
+    large_units = financial_compound_units if n < COMPOUND_MAX else financial_large_units
+    return int_to_normal(n), int_to_numeral(n, financial_chars, financial_groups, large_units)
 
 
 def format_output(output: tuple[str, str]):
@@ -81,4 +85,4 @@ def format_output(output: tuple[str, str]):
 
 
 chinese_numeral_card = ResultCard("Chinese numeral", None, eval_method=int_to_chinese_numeral, wiki='Chinese_numerals',
-                                  format_output=format_output, applicable=not_too_big)
+                                  format_output=format_output, applicable=numeral_applicable(0))
@@ -3,130 +3,98 @@
 # Copyright (c) 2013, Savoir-faire Linux inc.  All Rights Reserved.
 # Copyright (c) 2022, Qijia Liu
 
-from collections import OrderedDict
-from typing import Union
+from functools import lru_cache
 
-from sympy import Integer
-
-from extension.util import DICT, format_text, take_int_input
+from extension.elementary.util import digit_groups, numeral_applicable
+from extension.util import format_text, take_int_input
 from gamma.result_card import ResultCard
 
-TEMP = list[Union[tuple[str, int], 'TEMP']]
-
-
-class Num2Word:
-    def __init__(self):
-        lows = ["non", "oct", "sept", "sext", "quint", "quadr", "tr", "b", "m"]
-        units = ["", "un", "duo", "tre", "quattuor", "quin", "sex", "sept", "octo", "novem"]
-        tens = ["dec", "vigint", "trigint", "quadragint", "quinquagint",
-                "sexagint", "septuagint", "octogint", "nonagint"]
-        self.high_numwords = ["cent"] + self.gen_high_numwords(units, tens, lows)
-        self.mid_numwords = [(1000, "thousand"), (100, "hundred"), (90, "ninety"), (80, "eighty"), (70, "seventy"),
-                             (60, "sixty"), (50, "fifty"), (40, "forty"), (30, "thirty")]
-        self.low_numwords = ["twenty", "nineteen", "eighteen", "seventeen", "sixteen", "fifteen", "fourteen",
-                             "thirteen", "twelve", "eleven", "ten", "nine", "eight", "seven", "six", "five", "four",
-                             "three", "two", "one", "zero"]
-        self.cards: OrderedDict[int, str] = OrderedDict()
-        self.set_numwords()
-        self.MAXVAL = 1000 * list(self.cards.keys())[0]
-
-    @staticmethod
-    def gen_high_numwords(units: list[str], tens: list[str], lows: list[str]):
-        out = [u + t for t in tens for u in units]
-        out.reverse()
-        return out + lows
-
-    def set_numwords(self):
-        self.set_high_numwords(self.high_numwords)
-        self.set_mid_numwords(self.mid_numwords)
-        self.set_low_numwords(self.low_numwords)
-
-    def set_high_numwords(self, high: list[str]):
-        max = 3 + 3 * len(high)
-        for word, n in zip(high, range(max, 3, -3)):
-            self.cards[10 ** n] = word + "illion"
-
-    def set_mid_numwords(self, mid: list[tuple[int, str]]):
-        for key, val in mid:
-            self.cards[key] = val
-
-    def set_low_numwords(self, numwords: list[str]):
-        for word, n in zip(numwords, range(len(numwords) - 1, -1, -1)):
-            self.cards[n] = word
-
-    def splitnum(self, value: int) -> TEMP:
-        elem = next(e for e in self.cards if e <= value)
-
-        out: TEMP = []
-        if value == 0:
-            div, mod = 1, 0
-        else:
-            div, mod = divmod(value, elem)
-
-        if div == 1:
-            out.append((self.cards[1], 1))
-        else:
-            out.append(self.splitnum(div))
-
-        out.append((self.cards[elem], elem))
-
-        if mod:
-            out.append(self.splitnum(mod))
-
-        return out
-
-    def to_cardinal(self, value: int) -> str:
-        val = self.splitnum(value)
-        words, num = self.clean(val)
-        return words
-
-    def merge(self, lpair: tuple[str, int], rpair: tuple[str, int]) -> tuple[str, int]:
-        ltext, lnum = lpair
-        rtext, rnum = rpair
-        if lnum == 1 and rnum < 100:
-            return rtext, rnum
-        elif 100 > lnum > rnum:
-            return "%s-%s" % (ltext, rtext), lnum + rnum
-        elif lnum >= 100 > rnum:
-            return "%s and %s" % (ltext, rtext), lnum + rnum
-        elif rnum > lnum:
-            return "%s %s" % (ltext, rtext), lnum * rnum
-        return "%s, %s" % (ltext, rtext), lnum + rnum
-
-    def clean(self, val: TEMP) -> tuple[str, int]:
-        out = val
-        while len(val) != 1:
-            out = []
-            left, right = val[:2]
-            if isinstance(left, tuple) and isinstance(right, tuple):
-                out.append(self.merge(left, right))
-                if val[2:]:
-                    out.append(val[2:])
-            else:
-                for elem in val:
-                    if isinstance(elem, list):
-                        if len(elem) == 1:
-                            out.append(elem[0])
-                        else:
-                            out.append(self.clean(elem))
-                    else:
-                        out.append(elem)
-            val = out
-        return out[0]  # type: ignore
-
-
-en = Num2Word()
-
-
-def not_too_big(components: DICT) -> bool:
-    n = components['input_evaluated']
-    return isinstance(n, Integer) and 0 <= n < en.MAXVAL
+low_numwords = ["zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven",
+                "twelve", "thirteen", "fourteen", "fifteen", "sixteen", "seventeen", "eighteen", "nineteen"]
+tens_numwords = ["", "", "twenty", "thirty", "forty", "fifty", "sixty", "seventy", "eighty", "ninety"]
+
+# prefixes of the n-th -illion up to the centillion, as num2words names them
+lows = ["m", "b", "tr", "quadr", "quint", "sext", "sept", "oct", "non"]
+units = ["", "un", "duo", "tre", "quattuor", "quin", "sex", "sept", "octo", "novem"]
+tens = ["dec", "vigint", "trigint", "quadragint", "quinquagint", "sexagint", "septuagint", "octogint", "nonagint"]
+illion_prefixes = [""] + lows + [u + t for t in tens for u in units] + ["cent"]
+
+# Conway-Wechsler names beyond, each component with the initials that change the units before it
+cw_units = ["", "un", "duo", "tre", "quattuor", "quinqua", "se", "septe", "octo", "nove"]
+cw_tens = [("", ""), ("deci", "n"), ("viginti", "ms"), ("triginta", "ns"), ("quadraginta", "ns"),
+           ("quinquaginta", "ns"), ("sexaginta", "n"), ("septuaginta", "n"), ("octoginta", "mx"), ("nonaginta", "")]
+cw_hundreds = [("", ""), ("centi", "nx"), ("ducenti", "n"), ("trecenti", "ns"), ("quadringenti", "ns"),
+               ("quingenti", "ns"), ("sescenti", "n"), ("septingenti", "n"), ("octingenti", "mx"), ("nongenti", "")]
+cw_lows = ["n", "m", "b", "tr", "quadr", "quint", "sext", "sept", "oct", "non"]
+
+
+def group_words(g: int) -> str:
+    hundreds, rest = divmod(g, 100)
+    words = []
+    if hundreds:
+        words.append(low_numwords[hundreds] + " hundred")
+    if rest >= 20:
+        words.append(tens_numwords[rest // 10] + ("-" + low_numwords[rest % 10] if rest % 10 else ""))
+    elif rest:
+        words.append(low_numwords[rest])
+    return " and ".join(words)
+
+
+group_numwords = [group_words(g) for g in range(1000)]
+
+
+def cw_prefix(g: int) -> str:
+    """Conway-Wechsler prefix of 0 <= g < 1000, as it appears before -illi-."""
+    if g < 10:
+        return cw_lows[g]
+    hundreds, rest = divmod(g, 100)
+    ten, unit = divmod(rest, 10)
+    tens_word, tens_marks = cw_tens[ten]
+    hundreds_word, hundreds_marks = cw_hundreds[hundreds]
+    marks = tens_marks if ten else hundreds_marks
+    unit_word = cw_units[unit]
+    if unit == 3 and ("s" in marks or "x" in marks):
+        unit_word += "s"
+    elif unit == 6 and ("s" in marks or "x" in marks):
+        unit_word += "s" if "s" in marks else "x"
+    elif unit in (7, 9) and ("m" in marks or "n" in marks):
+        unit_word += "m" if "m" in marks else "n"
+    # the last vowel is dropped before -illi-
+    return (unit_word + tens_word + hundreds_word)[:-1]
+
+
+@lru_cache(maxsize=1024)
+def illion(n: int) -> str:
+    """Name of 10^(3n + 3)."""
+    if n < len(illion_prefixes):
+        return illion_prefixes[n] + "illion"
+    return "illi".join(cw_prefix(g) for g in digit_groups(n, 3)) + "illion"
+
+
+def scale(i: int) -> str:
+    """Name of 1000^i."""
+    if i == 0:
+        return ""
+    if i == 1:
+        return " thousand"
+    return " " + illion(i - 1)
 
 
 @take_int_input
 def int_to_english_numeral(n: int) -> str:
-    return en.to_cardinal(n)
+    if n == 0:
+        return low_numwords[0]
+    groups = digit_groups(n, 3)
+    buffer = []
+    for i, g in enumerate(groups):
+        if not g:
+            continue
+        if buffer:
+            # only a remainder below 100 is joined with "and"
+            buffer.append(" and " if i == len(groups) - 1 and g < 100 else ", ")
+        buffer.append(group_numwords[g] + scale(len(groups) - 1 - i))
+    return "".join(buffer)
 
 
 english_numeral_card = ResultCard("English numeral", None, eval_method=int_to_english_numeral, wiki='English_numerals',
-                                  format_output=format_text, applicable=not_too_big)
+                                  format_output=format_text, applicable=numeral_applicable(0))
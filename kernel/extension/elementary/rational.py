@@ -4,7 +4,7 @@ from extension.util import DICT, format_latex
 from gamma.result_card import ResultCard
 
 
-def format_input(result_statement, input_repr, components: DICT):
+def format_input(result_statement, input_evaluated, components: DICT, parameters=None):
     expression = components['expression']
     return f"Rational('{expression}')"
 
@@ -1,14 +1,10 @@
-from sympy import Integer
-
-from extension.util import DICT, format_latex, take_int_input
+from extension.elementary.util import digit_groups, numeral_applicable
+from extension.util import format_latex, take_int_input
 from gamma.result_card import ResultCard
 
 roman_chars = ['I', 'V', 'X', 'L', 'C', 'D', 'M', '', '']
-
-
-def between_1_and_3999(components: DICT) -> bool:
-    n = components['input_evaluated']
-    return isinstance(n, Integer) and 1 <= n <= 3999
+# every group of 3 digits is 1000 times the next one, marked by one more vinculum; deeper ones are unreadable
+ROMAN_MAX_DIGITS = 30
 
 
 def helper(digit: int, one: str, five: str, ten: str) -> str:
@@ -23,16 +19,33 @@ def helper(digit: int, one: str, five: str, ten: str) -> str:
     return one + ten
 
 
-@take_int_input
-def int_to_roman_numeral(n: int) -> str:
-    i = 0
+def group_numeral(g: int) -> str:
     ret = ''
-    while n:
-        n, r = divmod(n, 10)
-        ret = helper(r, roman_chars[i], roman_chars[i+1], roman_chars[i + 2]) + ret
+    i = 0
+    while g:
+        g, r = divmod(g, 10)
+        ret = helper(r, roman_chars[i], roman_chars[i + 1], roman_chars[i + 2]) + ret
         i += 2
-    return R'\mathrm{' + ret + '}'
+    return ret
+
+
+# up to MMMCMXCIX, without vinculum
+roman_groups = [group_numeral(g) for g in range(4000)]
+
+
+@take_int_input
+def int_to_roman_numeral(n: int) -> str:
+    if n < len(roman_groups):
+        return R'\mathrm{' + roman_groups[n] + '}'
+    groups = digit_groups(n, 3)
+    buffer = [R'\mathrm{']
+    for i, g in enumerate(groups):
+        if g:
+            vinculum = len(groups) - 1 - i
+            buffer.append(R'\overline{' * vinculum + roman_groups[g] + '}' * vinculum)
+    buffer.append('}')
+    return ''.join(buffer)
 
 
 roman_numeral_card = ResultCard("Roman numeral", None, eval_method=int_to_roman_numeral, format_output=format_latex,
-                                applicable=between_1_and_3999, wiki='Roman_numerals')
+                                applicable=numeral_applicable(1, ROMAN_MAX_DIGITS), wiki='Roman_numerals')
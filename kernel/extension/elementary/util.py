@@ -0,0 +1,21 @@
+from sympy import Integer
+
+from extension.util import DICT
+from gamma.utils import count_digits, int_to_str
+
+# numerals of longer numbers are too long to read
+NUMERAL_MAX_DIGITS = 10 ** 4
+
+
+def numeral_applicable(low: int, max_digits: int = NUMERAL_MAX_DIGITS):
+    def applicable(components: DICT) -> bool:
+        n = components['input_evaluated']
+        return isinstance(n, Integer) and n >= low and count_digits(int(n)) <= max_digits
+    return applicable
+
+
+def digit_groups(n: int, size: int) -> list[int]:
+    """Groups of size digits of n >= 0, the most significant first, from a single decimal conversion."""
+    digits = int_to_str(n)
+    digits = digits.zfill(-(-len(digits) // size) * size)
+    return [int(digits[i:i + size]) for i in range(0, len(digits), size)]
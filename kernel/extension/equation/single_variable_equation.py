@@ -1,11 +1,103 @@
-from sympy import S, Set, Symbol, solveset
+from typing import NamedTuple
+
+import mpmath
+import numpy as np
+from sympy import ConditionSet, Equality, Expr, FiniteSet, Float, Interval, S, Set, Symbol, lambdify, solveset
+from sympy.calculus.util import continuous_domain
 
 from extension.util import DICT, Latex, format_latex, no_undefined_function
 from gamma.result_card import ResultCard
-from gamma.utils import latex
+from gamma.utils import Budget, latex
+
+# the seconds of the numeric search; solveset can't be interrupted, so it is not bounded
+NUMERIC_ROOT_SECONDS = 5
+# digits of numeric roots
+ROOT_DIGITS = 15
+# sign changes are searched on a grid over [-ROOT_RANGE, ROOT_RANGE], denser near 0
+ROOT_RANGE = 10 ** 6
+ROOT_GRID_POINTS = 10 ** 5 + 1
+# derivatives tried to bound the number of real roots
+ROOT_BOUND_DERIVATIVES = 3
+
+
+class Roots(NamedTuple):
+    result: Set
+    x: Symbol
+    is_complex: bool
+    digits: int | None = None  # None unless the roots are numeric
+    partial: bool = False  # the numeric search ran out of time
+    complete: bool = True  # every root, rather than those the numeric search found
+
+
+def is_solved(result: Set) -> bool:
+    return not result.has(ConditionSet)
+
+
+def root_grid() -> np.ndarray:
+    bound = np.arcsinh(ROOT_RANGE)
+    return np.sinh(np.linspace(-bound, bound, ROOT_GRID_POINTS))
+
+
+def brackets(f, grid: np.ndarray) -> list[tuple[float, float]]:
+    """Intervals of the grid where f is 0 or changes its sign, the ones closest to 0 first."""
+    with np.errstate(all='ignore'):
+        y = np.broadcast_to(np.asarray(f(grid)), grid.shape)
+    if np.iscomplexobj(y):
+        y = np.where(np.abs(y.imag) <= np.abs(y.real) * np.finfo(float).eps, y.real, np.nan)
+    y = y.astype(float)
+    sign = np.where(np.isfinite(y), np.sign(y), np.nan)
+    zeros = np.flatnonzero(sign == 0)
+    changes = np.flatnonzero(sign[:-1] * sign[1:] < 0)
+    intervals = [(grid[i], grid[i]) for i in zeros] + [(grid[i], grid[i + 1]) for i in changes]
+    return sorted(intervals, key=lambda interval: min(abs(interval[0]), abs(interval[1])))
+
+
+def numeric_roots(equation: Expr, x: Symbol, digits: int, budget: Budget) -> list[Float]:
+    """
+    Real roots from sign changes of the equation on a grid, each polished by mpmath.findroot
+    to the digits. A sign change across a pole doesn't converge, so it is not a root.
+    """
+    intervals = brackets(lambdify(x, equation, 'numpy'), root_grid())
+    f = lambdify(x, equation, 'mpmath')
+    roots: list[Float] = []
+    with mpmath.workdps(digits + 5):
+        for a, b in intervals:
+            if not budget.charge():
+                break
+            if a == b:
+                root = mpmath.mpf(a)
+            else:
+                try:
+                    root = mpmath.findroot(f, (a, b), solver='illinois')
+                except (ValueError, ZeroDivisionError):
+                    continue
+                if not (a <= root <= b):
+                    continue
+            roots.append(Float(root, digits))
+    return sorted(set(roots))
+
+
+def root_bound(equation: Expr, x: Symbol) -> int | None:
+    """
+    At most how many real roots the equation has, None if unknown. By Rolle's theorem, if it is
+    differentiable k times on an interval where its k-th derivative has m roots, it has at most m + k.
+    """
+    domain = continuous_domain(equation, x, S.Reals)
+    if not isinstance(domain, Interval):
+        return None
+    derivative = equation
+    for k in range(1, ROOT_BOUND_DERIVATIVES + 1):
+        derivative = derivative.diff(x)
+        if continuous_domain(derivative, x, domain) != domain:
+            return None
+        zeros = solveset(derivative, x, domain)
+        if zeros.is_empty or isinstance(zeros, FiniteSet):
+            return len(zeros) + k
+    return None
 
 
-def solve_single_var(components: DICT, parameters=None) -> tuple[Set, Symbol, bool]:
+def solve_single_var(components: DICT, parameters=None) -> Roots:
+    """solveset, then a numeric search for the real roots if it leaves a ConditionSet."""
     equation = components['input_evaluated']
     x: Symbol = components['variable']
     try:
@@ -14,12 +106,31 @@ def solve_single_var(components: DICT, parameters=None) -> tuple[Set, Symbol, bo
     except ValueError:
         result = solveset(equation, x, S.Reals)
         is_complex = False
-    return result, x, is_complex
+    if is_solved(result):
+        return Roots(result, x, is_complex)
+    if isinstance(equation, Equality):
+        equation = equation.lhs - equation.rhs
+    if equation.free_symbols == {x}:
+        budget = Budget(seconds=NUMERIC_ROOT_SECONDS)
+        roots = numeric_roots(equation, x, ROOT_DIGITS, budget)
+        if roots:
+            # the search can't tell a missed root, but as many roots as the bound are every root
+            complete = not budget.exhausted and len(roots) == root_bound(equation, x)
+            return Roots(FiniteSet(*roots), x, False, ROOT_DIGITS, budget.exhausted, complete)
+    return Roots(result, x, is_complex)
 
 
-def format_solution(output: tuple[Set, Symbol, bool]):
-    result, x, is_complex = output
-    pre_output = f'{"Complex" if is_complex else "Real"} root: '
+def format_solution(output: Roots):
+    result, x, is_complex, digits, partial, complete = output
+    if not complete:
+        # not every root, so not x \in
+        searched = f', numeric to {digits} digits' + (', before the search ran out of time: ' if partial else ': ')
+        return format_latex(Latex().t('Some real roots in ').a(latex(Interval(-ROOT_RANGE, ROOT_RANGE)))
+                            .t(searched).a(latex(result)).f())
+    if digits is None:
+        pre_output = f'{"Complex" if is_complex else "Real"} root: '
+    else:
+        pre_output = f'Real root, numeric to {digits} digits: '
     return format_latex(Latex().t(pre_output).a(latex(x), R' \in', latex(result)).f())
 
 
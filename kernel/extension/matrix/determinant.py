@@ -0,0 +1,11 @@
+from extension.matrix.util import echelon, is_square
+from extension.util import DICT
+from gamma.result_card import ResultCard
+
+
+def determinant(components: DICT, parameters: None = None):
+    return echelon(components['input_evaluated']).det
+
+
+determinant_card = ResultCard("Determinant", "(%s).det()", eval_method=determinant, applicable=is_square,
+                              wiki='Determinant')
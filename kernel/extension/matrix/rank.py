@@ -0,0 +1,12 @@
+from sympy import Integer
+
+from extension.matrix.util import echelon
+from extension.util import DICT
+from gamma.result_card import ResultCard
+
+
+def rank(components: DICT, parameters: None = None) -> Integer:
+    return Integer(len(echelon(components['input_evaluated']).pivots))
+
+
+rank_card = ResultCard("Rank", "(%s).rank()", eval_method=rank, wiki='Rank_(linear_algebra)')
@@ -0,0 +1,10 @@
+from extension.matrix.util import echelon
+from extension.util import DICT
+from gamma.result_card import ResultCard
+
+
+def rref(components: DICT, parameters: None = None):
+    return echelon(components['input_evaluated']).rref
+
+
+rref_card = ResultCard("Reduced row echelon form", "(%s).rref()[0]", eval_method=rref, wiki='Row_echelon_form')
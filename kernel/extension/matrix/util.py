@@ -0,0 +1,194 @@
+import math
+from functools import lru_cache
+from typing import NamedTuple
+
+import numpy as np
+import sympy
+from sympy import ImmutableMatrix, Matrix, Poly, Rational, Symbol, roots
+from sympy.matrices.common import NonInvertibleMatrixError
+from sympy.polys.matrices import DomainMatrix
+from sympy.polys.matrices.exceptions import DMNonInvertibleMatrixError
+
+from extension.util import DICT
+
+# exact eigenvalues of larger matrices take too long, so they are computed numerically
+EXACT_EIGEN_SIZE = 8
+
+
+class Echelon(NamedTuple):
+    rref: Matrix
+    pivots: tuple[int, ...]
+    det: sympy.Expr | None  # None unless square
+
+
+def is_square(components: DICT) -> bool:
+    return components['input_evaluated'].is_square
+
+
+def domain_matrix(M: Matrix) -> DomainMatrix:
+    """M over the smallest domain of its entries: ZZ and QQ are exact, RR and CC numeric, others symbolic."""
+    return DomainMatrix.from_Matrix(M)
+
+
+def is_exact(dM: DomainMatrix) -> bool:
+    return dM.domain.is_ZZ or dM.domain.is_QQ
+
+
+def is_numeric(dM: DomainMatrix) -> bool:
+    return dM.domain.is_RR or dM.domain.is_CC
+
+
+def to_array(dM: DomainMatrix) -> np.ndarray:
+    return np.array(dM.to_Matrix().evalf().tolist(), dtype=complex if dM.domain.is_CC else float)
+
+
+def fraction_free_rref(a: list[list[int]]) -> tuple[list[int], int, int]:
+    """
+    Gauss-Jordan elimination without fractions, turning the integer rows into den * rref in place.
+    Every entry stays a minor of the input, so each division is exact, and den is the minor of
+    the pivots. Returns the pivots, den and the sign of the row swaps.
+    """
+    m = len(a)
+    n = len(a[0]) if a else 0
+    pivots: list[int] = []
+    den = 1
+    sign = 1
+    i = 0
+    for j in range(n):
+        if i == m:
+            break
+        r = next((r for r in range(i, m) if a[r][j]), None)
+        if r is None:
+            continue
+        if r != i:
+            a[i], a[r] = a[r], a[i]
+            sign = -sign
+        pivot_row = a[i]
+        p = pivot_row[j]
+        for k in range(m):
+            if k != i:
+                c = a[k][j]
+                a[k] = [(p * x - c * y) // den for x, y in zip(a[k], pivot_row)]
+        pivots.append(j)
+        den = p
+        i += 1
+    return pivots, den, sign
+
+
+def exact_echelon(dM: DomainMatrix) -> Echelon:
+    K = dM.domain
+    rows = []
+    scale = 1  # the determinant is multiplied by the denominators cleared from the rows
+    for row in dM.to_list():
+        d = math.lcm(*(int(K.denom(x)) for x in row))
+        rows.append([int(K.numer(x)) * (d // int(K.denom(x))) for x in row])
+        scale *= d
+    m, n = dM.shape
+    pivots, den, sign = fraction_free_rref(rows)
+    rref = Matrix(m, n, [Rational(x, den) for row in rows for x in row])
+    det = None
+    if m == n:
+        det = Rational(sign * den, scale) if len(pivots) == n else sympy.S.Zero
+    return Echelon(rref, tuple(pivots), det)
+
+
+def numeric_echelon(a: np.ndarray) -> Echelon:
+    """Gauss-Jordan elimination with partial pivoting, pivots below the tolerance of LAPACK's rank counting as 0."""
+    a = a.copy()
+    m, n = a.shape
+    tolerance = np.abs(a).max(initial=0) * max(m, n) * np.finfo(float).eps
+    pivots: list[int] = []
+    det = 1
+    i = 0
+    for j in range(n):
+        if i == m:
+            break
+        r = i + int(np.argmax(np.abs(a[i:, j])))
+        if abs(a[r, j]) <= tolerance:
+            a[i:, j] = 0
+            continue
+        if r != i:
+            a[[i, r]] = a[[r, i]]
+            det = -det
+        det *= a[i, j]
+        a[i] /= a[i, j]
+        factors = a[:, j].copy()
+        factors[i] = 0
+        a -= np.outer(factors, a[i])
+        pivots.append(j)
+        i += 1
+    return Echelon(Matrix(a), tuple(pivots),
+                   None if m != n else sympy.sympify(det if len(pivots) == n else 0.0))
+
+
+@lru_cache(maxsize=16)
+def _echelon(M: ImmutableMatrix) -> Echelon:
+    dM = domain_matrix(M)
+    if is_exact(dM):
+        return exact_echelon(dM)
+    if is_numeric(dM):
+        return numeric_echelon(to_array(dM))
+    rref, pivots = M.rref()
+    return Echelon(rref, pivots, M.det() if M.is_square else None)
+
+
+def echelon(M: Matrix) -> Echelon:
+    """One elimination of M shared by its determinant, rank and RREF."""
+    return _echelon(M.as_immutable())
+
+
+def numeric_eigenvalues(values: np.ndarray, tolerance: float) -> list[tuple[sympy.Expr, list[int]]]:
+    """Eigenvalues with the indices of the close ones, real when the imaginary part is below the tolerance."""
+    groups: list[tuple[complex, list[int]]] = []
+    for i, value in enumerate(values):
+        value = complex(value)
+        if abs(value.imag) <= tolerance:
+            value = complex(value.real)
+        for representative, indices in groups:
+            if abs(representative - value) <= tolerance:
+                indices.append(i)
+                break
+        else:
+            groups.append((value, [i]))
+    return [(sympy.sympify(value.real if not value.imag else value), indices) for value, indices in groups]
+
+
+def tolerance_of(a: np.ndarray) -> float:
+    return float(np.abs(a).max(initial=0) * max(a.shape) * np.sqrt(np.finfo(float).eps))
+
+
+def eigenvals(M: Matrix) -> dict:
+    dM = domain_matrix(M)
+    if is_exact(dM) and M.rows <= EXACT_EIGEN_SIZE:
+        x = Symbol('x')
+        eigenvalues = roots(Poly(dM.charpoly(), x, domain=dM.domain))
+        if sum(eigenvalues.values()) == M.rows:
+            return eigenvalues
+    elif not is_exact(dM) and not is_numeric(dM):
+        return M.eigenvals()
+    a = to_array(dM)
+    values = np.linalg.eigvals(a)
+    return {value: len(indices) for value, indices in numeric_eigenvalues(values, tolerance_of(a))}
+
+
+def eigenvects(M: Matrix) -> list:
+    dM = domain_matrix(M)
+    if not is_numeric(dM) and not (is_exact(dM) and M.rows > EXACT_EIGEN_SIZE):
+        return M.eigenvects()
+    a = to_array(dM)
+    values, vectors = np.linalg.eig(a)
+    return [(value, len(indices), [Matrix(vectors[:, i]) for i in indices])
+            for value, indices in numeric_eigenvalues(values, tolerance_of(a))]
+
+
+def inverse(M: Matrix) -> Matrix:
+    """Raises NonInvertibleMatrixError for a singular M, as M.inv() does."""
+    dM = domain_matrix(M)
+    try:
+        if is_exact(dM):
+            return dM.to_field().inv().to_Matrix()
+        if is_numeric(dM):
+            return Matrix(np.linalg.inv(to_array(dM)))
+    except (DMNonInvertibleMatrixError, np.linalg.LinAlgError):
+        raise NonInvertibleMatrixError("Matrix det == 0; not invertible.") from None
+    return M.inv()
@@ -1,41 +1,140 @@
-from typing import Generator, cast
+import math
+from fractions import Fraction
+from itertools import islice
+from typing import Iterator
 
-from sympy import Integer, continued_fraction, continued_fraction_iterator
+from sympy import Float, Integer, Pow, Rational, S, radsimp
 
 from data_type import ContinuedFraction
 from extension.util import DICT
 from gamma.result_card import ResultCard
 
+# terms shown of a continued fraction that doesn't terminate or repeat
+TERMS = 10
+# terms computed at most, for long rationals and long periods, and shown at most
+MAX_TERMS = 1000
+# bits of precision tried at most for other irrationals
+MAX_PRECISION = 2 ** 14
+
 
 def not_integer(components: DICT) -> bool:
     return not isinstance(components['input_evaluated'], Integer)
 
 
-def continued_frac(components: DICT, parameters=None) -> tuple[int, list[int], list[int] | None]:
-    num = components['input_evaluated'].nsimplify()
-    try:
-        res: list = continued_fraction(num)
-        if isinstance(res[0], list):
-            n = res[0][0]
-            res = [n] + [res[0][1:] + [n]]
-        n = int(res[0])
-        if isinstance(res[-1], list):  # periodic
-            finite = list(map(int, res[1:-1]))
-            repeated = list(map(int, res[-1]))
-        else:  # rational
-            finite = list(map(int, res[1:]))
-            repeated = []
-    except ValueError:  # non-periodic irrational
-        iterator = cast(Generator[int, None, None], continued_fraction_iterator(num))
-        n = int(next(iterator))
-        finite = [int(next(iterator)) for _ in range(9)]
-        repeated = None
-    return n, finite, repeated
-
-
-def format_output(output: tuple[int, list[int], list[int] | None]):
-    n, finite, repeated = output
-    return ContinuedFraction(n=n, finite=finite, repeated=repeated)
+def interval_terms(lo: Fraction, hi: Fraction) -> Iterator[int]:
+    """
+    Terms shared by every number in [lo, hi], followed by the last term of
+    the simplest rational in it, if the interval isn't a single point.
+    """
+    while True:
+        a = math.floor(lo)
+        if a == lo or a != math.floor(hi):
+            yield a if a == lo else a + 1
+            return
+        yield a
+        lo, hi = 1 / (hi - a), 1 / (lo - a)
+
+
+def float_terms(x: Float) -> Iterator[int]:
+    """Expand the interval of numbers that round to x, at its precision, exactly."""
+    sign, man, exp, bc = x._mpf_
+    if not man:
+        yield 0
+        return
+    value = Fraction(-man if sign else man) * Fraction(2) ** exp
+    half_ulp = Fraction(2) ** (exp + bc - x._prec - 1)
+    yield from interval_terms(value - half_ulp, value + half_ulp)
+
+
+def quadratic_form(x) -> tuple[int, int, int] | None:
+    """Integers P, Q, D with x = (P + sqrt(D))/Q and Q | D - P^2, if x is a quadratic irrational."""
+    roots = [p for p in x.atoms(Pow) if p.exp == S.Half and p.base.is_Integer and p.base > 0]
+    if len(roots) != 1:
+        return None
+    root = roots[0]
+    x = radsimp(x).expand()
+    a, b = x.coeff(root, 0), x.coeff(root, 1)
+    if not (a.is_Rational and b.is_Rational and b != 0 and (x - a - b * root).expand() == 0):
+        return None
+    Q = math.lcm(int(a.q), int(b.q))
+    P, B = int(a * Q), int(b * Q)
+    if B < 0:
+        P, B, Q = -P, -B, -Q
+    D = B * B * int(root.base)
+    if (D - P * P) % Q:
+        P, Q, D = P * abs(Q), Q * abs(Q), D * Q * Q
+    return P, Q, D
+
+
+def quadratic_terms(P: int, Q: int, D: int) -> Iterator[tuple[int, tuple[int, int]]]:
+    """Terms of (P + sqrt(D))/Q, each with the state it was computed from."""
+    s = math.isqrt(D)
+    while True:
+        a = (P + s) // Q if Q > 0 else -((P + s) // -Q) - 1
+        yield a, (P, Q)
+        P = a * Q - P
+        Q = (D - P * P) // Q
+
+
+def numeric_terms(x, prec: int = 64) -> Iterator[int]:
+    """Expand an irrational x from intervals around its numerical value, raising the precision as needed."""
+    emitted = 0
+    while prec <= MAX_PRECISION:
+        value = Float(x.evalf(prec // 3 + 1, maxn=prec), prec // 3 + 1)
+        sign, man, exp, bc = value._mpf_
+        center = Fraction(-man if sign else man) * Fraction(2) ** exp
+        # evalf is accurate to a few units in the last place
+        error = abs(center) * Fraction(2) ** (4 - value._prec) + Fraction(2) ** -prec
+        terms = list(interval_terms(center - error, center + error))
+        # the last term is only a guess of the simplest rational in the interval
+        for term in terms[emitted:-1]:
+            yield term
+        emitted = max(emitted, len(terms) - 1)
+        prec *= 2
+
+
+def continued_frac(components: DICT, parameters=None) -> tuple[int, list[int], list[int] | None, bool]:
+    """
+    The integer part, the terms before the period and the period, None if the expansion
+    doesn't repeat, and whether a terminating expansion is cut short at MAX_TERMS.
+    """
+    x = components['input_evaluated']
+    terms = min(max(int((parameters or {}).get('terms', TERMS)), 1), MAX_TERMS)
+    if isinstance(x, Float):
+        expansion = list(islice(float_terms(x), MAX_TERMS + 1))
+    elif isinstance(x, Rational):
+        expansion = list(islice(interval_terms(Fraction(int(x.p), int(x.q)), Fraction(int(x.p), int(x.q))),
+                                MAX_TERMS + 1))
+    else:
+        form = quadratic_form(x)
+        if form is not None:
+            seen: dict[tuple[int, int], int] = {}
+            expansion = []
+            for a, state in islice(quadratic_terms(*form), MAX_TERMS):
+                if state in seen:
+                    start = seen[state]
+                    if start == 0:
+                        # purely periodic, shown as a0 followed by the period rotated
+                        return expansion[0], [], expansion[1:] + expansion[:1], False
+                    return expansion[0], expansion[1:start], expansion[start:], False
+                seen[state] = len(expansion)
+                expansion.append(a)
+            return expansion[0], expansion[1:terms], None, False
+        if not x.is_real or x.is_rational:
+            raise ValueError("Continued fraction needs an irrational real number")
+        expansion = list(islice(numeric_terms(x), terms))
+        if not expansion:
+            raise ValueError("Cannot tell the continued fraction from the numerical value")
+        return expansion[0], expansion[1:], None, False
+    if len(expansion) > MAX_TERMS:
+        # it terminates, but later
+        return expansion[0], expansion[1:terms], [], True
+    return expansion[0], expansion[1:], [], False
+
+
+def format_output(output: tuple[int, list[int], list[int] | None, bool]):
+    n, finite, repeated, truncated = output
+    return ContinuedFraction(n=n, finite=finite, repeated=repeated, truncated=truncated)
 
 
 continued_fraction_card = ResultCard('Continued fraction', None, eval_method=continued_frac, applicable=not_integer,
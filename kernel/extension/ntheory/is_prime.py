@@ -1,58 +1,132 @@
-from typing import Generator, cast
+from typing import cast
 
-from sympy import Integer, factorint, floor, latex, primerange, sqrt
+from sympy import Integer, Pow, floor, jacobi_symbol, latex, sqrt
+from sympy.ntheory.primetest import is_strong_lucas_prp
 
-from extension.ntheory.util import cross_mul, is_positive_integer, is_prime_from_factor_dict, pow_list_from_factor_dict
+from extension.ntheory.util import (cross_mul, factorize, is_positive_integer, is_prime_from_factor_dict,
+                                    pow_list_from_factor_dict, primes_upto)
 from extension.util import Latex, format_latex, take_int_input
 from gamma.result_card import ResultCard
 
+# trial division prints one line per prime up to sqrt(n), at most 168 lines below this
+TRIAL_DIVISION_LIMIT = 10 ** 6
+
+# (bound, bases): the strong probable prime test to these bases is deterministic for n < bound
+MILLER_RABIN_WITNESSES = [
+    (2047, [2]),
+    (1373653, [2, 3]),
+    (25326001, [2, 3, 5]),
+    (3215031751, [2, 3, 5, 7]),
+    (2152302898747, [2, 3, 5, 7, 11]),
+    (3474749660383, [2, 3, 5, 7, 11, 13]),
+    (341550071728321, [2, 3, 5, 7, 11, 13, 17]),
+    (3825123056546413051, [2, 3, 5, 7, 11, 13, 17, 19, 23]),
+    (318665857834031151167461, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37]),
+    (3317044064679887385961981, [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]),
+]
+
+
+def mod(n: int) -> str:
+    return R'\pmod{%s}' % n
+
+
+def strong_prp_step(L: Latex, n: int, base: int, s: int, d: int) -> bool:
+    """Print why n is, or is not, a strong probable prime to base, given n - 1 = 2^s * d."""
+    x = pow(base, d, n)
+    if x in (1, n - 1):
+        L.a(f'{base}^{{{d}}}', R'\equiv', 1 if x == 1 else -1, mod(n)).n()
+        return True
+    for r in range(1, s):
+        x = x * x % n
+        if x == n - 1:
+            L.a(f'{base}^{{2^{{{r}}}' + R'\times' + f'{d}}}', R'\equiv', -1, mod(n)).n()
+            return True
+        if x == 1:
+            break
+    L.a(f'{base}^{{{d}}}', R'\equiv', pow(base, d, n), mod(n))\
+        .t(' and no ').a(f'{base}^{{2^r' + R'\times' + f'{d}}}').t(' with ').a('r<', s)\
+        .t(' is ').a(R'\equiv', -1).t(', so ').a(base).t(' is a witness that ').a(n).t(' is composite')
+    return False
+
+
+def miller_rabin_step(L: Latex, n: int) -> bool:
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    L.eq(n - 1, cross_mul(Pow(2, s, evaluate=False), d)).n()
+    for bound, bases in MILLER_RABIN_WITNESSES:
+        if n < bound:
+            L.t('Testing bases ').a(', '.join(map(str, bases))).t(' suffices for ').a(n, '<', bound).n()
+            break
+    else:
+        bases = [2]
+        L.t('Strong probable prime test to base ').a(2).n()
+    return all(strong_prp_step(L, n, base, s, d) for base in bases)
+
+
+def lucas_step(L: Latex, n: int):
+    D = 5
+    while jacobi_symbol(D, n) != -1:
+        D = -D + 2 if D < 0 else -D - 2
+    P, Q = 1, (1 - D) // 4
+    L.t('Selfridge parameters ').a(f'D={D}, P={P}, Q={Q}').t(' with ').a(R'\left(\frac{%s}{%s}\right)=-1' % (D, n)).n()
+    if is_strong_lucas_prp(n):
+        L.a(n).t(' is a strong Lucas probable prime').n()
+        L.t('So ').a(n).t(' passes the Baillie-PSW test, which no known composite number passes')
+    else:
+        L.a(n).t(' is not a strong Lucas probable prime, so ').a(n).t(' is composite')
+
 
 @take_int_input
 def is_prime_step(n: int) -> str:
     L = Latex()
     if n == 1:
         L.a(1).t(' is not considered prime')
-    else:
-        factor_dict: dict[Integer, Integer] = factorint(n)
+    elif n <= 20:
+        factor_dict = factorize(n)
         pows = pow_list_from_factor_dict(factor_dict)
-        if n <= 20:
-            if is_prime_from_factor_dict(factor_dict):
-                L.t('You should remember all prime numbers within 20: ').n()\
-                    .a('2, 3, 5, 7, 11, 13, 17, 19')
-            else:
-                L.eq(n, cross_mul(*pows)).t(', so ').a(n).t(' is not prime')
-        elif n % 2 == 0 or n % 5 == 0:
-            L.t('The last digit of ').a(n).t(' is ').a(n % 10).\
-                t(' , so ').a(n).t(' is a multiple of ').a(2 if n % 2 == 0 else 5)
-        elif n % 3 == 0:
-            m = n
-            while m >= 20:
-                if m != n:
-                    L.n()
-                digits = list(int(d) for d in str(m))
-                sum_of_digits = sum(digits)
-                L.t('The sum of digits of ').a(m).t(' is ').eq('+'.join(str(m)), sum_of_digits)
-                m = sum_of_digits
-            L.t(', which is a multiple of 3').n()
-            L.t('So ').a(n).t(' is a multiple of 3')
+        if is_prime_from_factor_dict(factor_dict):
+            L.t('You should remember all prime numbers within 20: ').n()\
+                .a('2, 3, 5, 7, 11, 13, 17, 19')
         else:
-            square_root = sqrt(n)
-            if square_root.is_Integer:
-                L.eq(n, f'{square_root}^2').t(', so ').a(n).t(' is a multiple of ').a(square_root)
-            else:
-                floor_of_sqrt = cast(Integer, floor(square_root))
-                L.a(latex(sqrt(n, evaluate=False)), R'\approx', square_root.round(3))\
-                    .t(', so trying primes up to ').a(floor_of_sqrt).t(' suffices').n()
-                for p in cast(Generator[int, None, None], primerange(floor_of_sqrt + 1)):
-                    q, r = divmod(n, p)
-                    L.a(n, '=', cross_mul(q, p))
-                    if r == 0:
-                        L.n().t('So ').a(n).t(' is a multiple of ').a(p)
-                        break
-                    else:
-                        L.a('+', r).n()
+            L.eq(n, cross_mul(*pows)).t(', so ').a(n).t(' is not prime')
+    elif n % 2 == 0 or n % 5 == 0:
+        L.t('The last digit of ').a(n).t(' is ').a(n % 10).\
+            t(' , so ').a(n).t(' is a multiple of ').a(2 if n % 2 == 0 else 5)
+    elif n % 3 == 0:
+        m = n
+        while m >= 20:
+            if m != n:
+                L.n()
+            digits = list(int(d) for d in str(m))
+            sum_of_digits = sum(digits)
+            L.t('The sum of digits of ').a(m).t(' is ').eq('+'.join(str(m)), sum_of_digits)
+            m = sum_of_digits
+        L.t(', which is a multiple of 3').n()
+        L.t('So ').a(n).t(' is a multiple of 3')
+    else:
+        square_root = sqrt(n)
+        if square_root.is_Integer:
+            L.eq(n, f'{square_root}^2').t(', so ').a(n).t(' is a multiple of ').a(square_root)
+        elif n < TRIAL_DIVISION_LIMIT:
+            floor_of_sqrt = cast(Integer, floor(square_root))
+            L.a(latex(sqrt(n, evaluate=False)), R'\approx', square_root.round(3))\
+                .t(', so trying primes up to ').a(floor_of_sqrt).t(' suffices').n()
+            for p in primes_upto(floor_of_sqrt).tolist():
+                q, r = divmod(n, p)
+                L.a(n, '=', cross_mul(q, p))
+                if r == 0:
+                    L.n().t('So ').a(n).t(' is a multiple of ').a(p)
+                    break
                 else:
-                    L.t('So ').a(n).t(' is prime')
+                    L.a('+', r).n()
+            else:
+                L.t('So ').a(n).t(' is prime')
+        elif miller_rabin_step(L, n):
+            if n < MILLER_RABIN_WITNESSES[-1][0]:
+                L.t('So ').a(n).t(' is prime')
+            else:
+                lucas_step(L, n)
     return L.f()
 
 
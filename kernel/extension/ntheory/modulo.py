@@ -1,6 +1,7 @@
 from data_type import Table
 from extension.util import take_int_input
 from gamma.result_card import ResultCard
+from gamma.utils import shorten_integer
 
 
 @take_int_input
@@ -10,7 +11,7 @@ def modulo(n: int) -> tuple[int, list[int]]:
 
 def format_output(output: tuple[int, list[int]]):
     return Table(titles=['m'] + list(map(str, range(2, 10))),
-                 rows=[[f'{output[0]} mod m'] + [str(i) for i in output[1]]])
+                 rows=[[f'{shorten_integer(output[0])} mod m'] + [str(i) for i in output[1]]])
 
 
 modulo_card = ResultCard('Modulo 2 to 9', None, eval_method=modulo, format_output=format_output,
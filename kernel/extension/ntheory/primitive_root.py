@@ -1,20 +1,94 @@
-from sympy import Integer, igcd, is_primitive_root
+from sympy import Integer, igcd
 
-from extension.util import DICT, format_text, take_int_input
+from extension.ntheory.util import factorize
+from extension.util import DICT, format_text
 from gamma.result_card import ResultCard
+from gamma.utils import Budget
+
+MAX_N = 10 ** 12
+PAGE_SIZE = 50
+PRIMITIVE_ROOT_SECONDS = 2
+# all the roots are taken from powers of the smallest one only up to this phi(n)
+POWERS_MAX_PHI = 10 ** 6
 
 
 def not_too_big(components: DICT) -> bool:
     n = components['input_evaluated']
-    return isinstance(n, Integer) and 2 <= n <= 100
+    return isinstance(n, Integer) and 2 <= n <= MAX_N
+
+
+def totient(factors: dict[int, int]) -> int:
+    phi = 1
+    for p, e in factors.items():
+        phi *= (p - 1) * p ** (e - 1)
+    return phi
+
+
+def has_primitive_root(n: int, factors: dict[int, int]) -> bool:
+    """Only 1, 2, 4, p^k and 2p^k have primitive roots, for odd primes p."""
+    odd = {p: e for p, e in factors.items() if p != 2}
+    return n in (1, 2, 4) or (len(odd) == 1 and factors.get(2, 0) <= 1)
+
+
+def is_root(g: int, n: int, phi: int, phi_primes: list[int]) -> bool:
+    return igcd(g, n) == 1 and all(pow(g, phi // q, n) != 1 for q in phi_primes)
+
+
+def primitive_roots(n: int, offset: int = 0, limit: int = PAGE_SIZE) -> tuple[list[int], int]:
+    """
+    The primitive roots of n from offset, in ascending order, and how many
+    there are in total.
+
+    For small phi(n), pages reaching the last roots are taken from g^k for the
+    smallest root g and every k coprime to phi(n); otherwise candidates are
+    tested in ascending order against the prime factors of phi(n), until the
+    page is full or the time is up.
+    """
+    factors = factorize(n)
+    if not has_primitive_root(n, factors):
+        return [], 0
+    phi = totient(factors)
+    phi_factors = factorize(phi)
+    count = totient(phi_factors)
+    phi_primes = list(phi_factors)
+    if n == 2 or offset >= count:
+        return [1][offset:offset + limit], count
+    if count <= offset + limit and phi <= POWERS_MAX_PHI:
+        g = next(g for g in range(2, n) if is_root(g, n, phi, phi_primes))
+        roots = sorted(pow(g, k, n) for k in range(1, phi) if igcd(k, phi) == 1)
+        return roots[offset:offset + limit], count
+    budget = Budget(seconds=PRIMITIVE_ROOT_SECONDS)
+    roots = []
+    skipped = 0
+    for g in range(2, n):
+        if len(roots) == limit or budget.exhausted:
+            break
+        if is_root(g, n, phi, phi_primes):
+            if skipped < offset:
+                skipped += 1
+            else:
+                roots.append(g)
+    return roots, count
 
 
-@take_int_input
-def primitive_root(n: int) -> str:
-    primitive_roots = [i for i in range(1, n) if igcd(i, n) == 1 and is_primitive_root(i, n)]
-    if primitive_roots:
-        return ', '.join(map(str, primitive_roots))
-    return f"{n} doesn't have primitive root"
+def primitive_root(components: DICT, parameters: DICT | None = None) -> str:
+    n = int(components['input_evaluated'])
+    parameters = parameters or {}
+    offset = max(int(parameters.get('offset', 0)), 0)
+    limit = min(max(int(parameters.get('limit', PAGE_SIZE)), 1), PAGE_SIZE)
+    roots, count = primitive_roots(n, offset, limit)
+    if not count:
+        return f"{n} doesn't have primitive root"
+    if offset >= count:
+        return f'No primitive root from offset {offset}, {n} has {count} primitive roots'
+    if not roots:
+        return f'Primitive roots from offset {offset} are not reached in time ({count} primitive roots in total)'
+    text = ', '.join(map(str, roots))
+    if offset:
+        text = '..., ' + text
+    if offset + len(roots) < count:
+        text += f', ... ({count} primitive roots in total)'
+    return text
 
 
 primitive_root_card = ResultCard('Primitive root modulo n', None, eval_method=primitive_root, applicable=not_too_big,
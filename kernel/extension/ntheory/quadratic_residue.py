@@ -1,17 +1,77 @@
-from sympy import Integer, quadratic_residues
+from functools import lru_cache
 
-from extension.util import DICT, format_text, take_int_input
+import numpy as np
+from sympy import Integer
+
+from extension.ntheory.util import factorize
+from extension.util import DICT, format_text
 from gamma.result_card import ResultCard
 
+MAX_N = 10 ** 7
+PAGE_SIZE = 50
+# squares computed at once, bounding the memory of the int64 temporaries
+CHUNK_SIZE = 2 ** 20
+
 
 def not_too_big(components: DICT) -> bool:
     n = components['input_evaluated']
-    return isinstance(n, Integer) and 2 <= n <= 100
+    return isinstance(n, Integer) and 2 <= n <= MAX_N
+
+
+def count_prime_power(p: int, k: int) -> int:
+    """Number of squares modulo p^k, 0 included."""
+    if k == 0:
+        return 1
+    if p == 2:
+        units = 1 if k <= 2 else 2 ** (k - 3)
+    else:
+        # exactly half of the units are squares, by Euler's criterion
+        units = (p - 1) * p ** (k - 1) // 2
+    if k == 1:
+        return units + 1
+    # the other squares are p^2 times the squares modulo p^(k-2)
+    return units + count_prime_power(p, k - 2)
+
+
+def count_residues(n: int) -> int:
+    """Number of squares modulo n, which is multiplicative by the CRT."""
+    count = 1
+    for p, k in factorize(n).items():
+        count *= count_prime_power(p, k)
+    return count
+
+
+@lru_cache(maxsize=4)
+def residue_bits(n: int) -> np.ndarray:
+    """Bitset of the squares modulo n, bit i set if i is a square."""
+    marks = np.zeros(n, dtype=bool)
+    # (n - i)^2 = i^2, so half of the range suffices
+    for start in range(0, n // 2 + 1, CHUNK_SIZE):
+        i = np.arange(start, min(start + CHUNK_SIZE, n // 2 + 1), dtype=np.int64)
+        marks[i * i % n] = True
+    return np.packbits(marks, bitorder='little')
+
+
+def quadratic_residues(n: int, offset: int = 0, limit: int = PAGE_SIZE) -> list[int]:
+    residues = np.flatnonzero(np.unpackbits(residue_bits(n), bitorder='little')[:n])
+    return residues[offset:offset + limit].tolist()
 
 
-@take_int_input
-def quadratic_residue(n: int) -> str:
-    return ', '.join(map(str, quadratic_residues(n)))
+def quadratic_residue(components: DICT, parameters: DICT | None = None) -> str:
+    n = int(components['input_evaluated'])
+    parameters = parameters or {}
+    offset = max(int(parameters.get('offset', 0)), 0)
+    limit = min(max(int(parameters.get('limit', PAGE_SIZE)), 1), PAGE_SIZE)
+    count = count_residues(n)
+    if offset >= count:
+        return f'No quadratic residue from offset {offset}, {n} has {count} quadratic residues'
+    residues = quadratic_residues(n, offset, limit)
+    text = ', '.join(map(str, residues))
+    if offset:
+        text = '..., ' + text
+    if offset + len(residues) < count:
+        text += f', ... ({count} quadratic residues in total, density {count / n:.4g})'
+    return text
 
 
 quadratic_residue_card = ResultCard('Quadratic residue', None, eval_method=quadratic_residue, applicable=not_too_big,
@@ -1,6 +1,7 @@
-from sympy import Integer, factorint, latex
+from sympy import latex
 
-from extension.ntheory.util import cross_mul, is_positive_integer, is_prime_from_factor_dict, pow_list_from_factor_dict
+from extension.ntheory.util import (cross_mul, factorize, is_positive_integer, is_prime_from_factor_dict,
+                                    pow_list_from_factor_dict)
 from extension.util import Latex, format_latex, t, take_int_input
 from gamma.result_card import ResultCard
 
@@ -11,7 +12,9 @@ def totient_step(n: int) -> str:
     if n == 1:
         L.a(1).t(' is coprime to itself')
     else:
-        factor_dict: dict[Integer, Integer] = factorint(n)
+        factor_dict = factorize(n)
+        if not factor_dict.complete:
+            raise ValueError(f"Cannot factor {factor_dict.cofactor} in time")
         pows = pow_list_from_factor_dict(factor_dict)
         if is_prime_from_factor_dict(factor_dict):
             L.a(n).t(' is prime')
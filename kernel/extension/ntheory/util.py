@@ -1,6 +1,24 @@
-from sympy import Integer, Pow, latex
+import math
+import time
+from collections import OrderedDict
+
+import numpy as np
+from sympy import Integer, Pow, isprime, latex, multiplicity, perfect_power, pollard_pm1, pollard_rho
 
 from extension.util import DICT
+from gamma.utils import Budget
+
+try:
+    from sympy.ntheory.ecm import _ecm_one_factor
+except ImportError:  # sympy < 1.11
+    _ecm_one_factor = None
+
+TRIAL_DIVISION_BOUND = 2 ** 15
+# covers every number below 2^27
+SIEVE_MAX_BYTES = 2 ** 26
+FACTORIZATION_SECONDS = 5
+# composites with more bits can't be tested for primality or split before the deadline
+SPLIT_MAX_BITS = 2 ** 15
 
 
 def is_positive_integer(components: DICT) -> bool:
@@ -18,3 +36,196 @@ def is_prime_from_factor_dict(factor_dict: dict[Integer, Integer]) -> bool:
 
 def cross_mul(*args) -> str:
     return R'\times'.join(latex(arg) for arg in args)
+
+
+class Sieve:
+    """
+    Sieve of Eratosthenes over the odd numbers, one byte per odd number,
+    grown segment by segment when a query needs more.
+
+    max_bytes -- memory cap, queries that would need more raise ValueError
+
+    flags -- initial flags, flags[i] is 1 if 2i+1 is prime; a memory-mapped
+    array from Sieve.load stays mapped until the sieve grows beyond it
+    """
+    def __init__(self, max_bytes: int = SIEVE_MAX_BYTES, flags: np.ndarray | None = None):
+        self.max_bytes = max_bytes
+        self.flags = np.array([0, 1], dtype=np.uint8) if flags is None else flags
+
+    @classmethod
+    def load(cls, path: str, max_bytes: int = SIEVE_MAX_BYTES) -> 'Sieve':
+        return cls(max_bytes, np.load(path, mmap_mode='r'))
+
+    def save(self, path: str):
+        np.save(path, np.asarray(self.flags))
+
+    @property
+    def limit(self) -> int:
+        """Every number below limit is sieved."""
+        return 2 * len(self.flags)
+
+    def extend(self, n: int):
+        """Sieve at least every number up to n."""
+        if n < self.limit:
+            return
+        size = max(n // 2 + 1, 2 * len(self.flags))
+        if size > self.max_bytes:
+            size = n // 2 + 1
+            if size > self.max_bytes:
+                raise ValueError(f"Sieving up to {n} needs more than {self.max_bytes} bytes")
+        root = math.isqrt(2 * size)
+        self.extend(root)
+        start = len(self.flags)
+        segment = np.ones(size - start, dtype=np.uint8)
+        for p in self.primes_upto(root)[1:].tolist():
+            # first odd multiple of p, not below p^2, in the segment
+            first = max(p * p, (2 * start + 1 + p - 1) // p * p)
+            if first % 2 == 0:
+                first += p
+            segment[(first - 1) // 2 - start::p] = 0
+        self.flags = np.concatenate((self.flags, segment))
+
+    def primes_upto(self, n: int) -> np.ndarray:
+        """Primes up to n, inclusive, in ascending order."""
+        if n < 2:
+            return np.empty(0, dtype=np.int64)
+        self.extend(n)
+        odd = 2 * np.flatnonzero(self.flags[:(n + 1) // 2]).astype(np.int64) + 1
+        return np.concatenate(([2], odd))
+
+    def is_small_prime(self, n: int) -> bool:
+        if n < 3:
+            return n == 2
+        self.extend(n)
+        return n % 2 == 1 and bool(self.flags[n // 2])
+
+    def smallest_factor(self, n: int) -> int:
+        """Smallest prime factor of n > 1, sieving up to sqrt(n)."""
+        if n % 2 == 0:
+            return 2
+        if n < self.limit:
+            if self.flags[n // 2]:
+                return n
+        primes = self.primes_upto(math.isqrt(n))[1:]
+        if n < 2 ** 63:
+            divisors = primes[n % primes == 0]
+        else:
+            divisors = [p for p in primes.tolist() if n % p == 0]
+        return int(divisors[0]) if len(divisors) else n
+
+
+sieve = Sieve()
+
+
+def load_sieve(path: str, max_bytes: int = SIEVE_MAX_BYTES):
+    """Use a sieve saved with Sieve.save, memory-mapped, for all ntheory cards."""
+    global sieve
+    sieve = Sieve.load(path, max_bytes)
+
+
+def primes_upto(n: int) -> np.ndarray:
+    return sieve.primes_upto(n)
+
+
+def is_small_prime(n: int) -> bool:
+    return sieve.is_small_prime(n)
+
+
+def smallest_factor(n: int) -> int:
+    return sieve.smallest_factor(n)
+
+
+class Factorization(dict):
+    """
+    Prime factors found so far, mapped to their multiplicity.
+
+    cofactor -- product of the composite parts not factored in time, 1 if
+    the factorization is complete
+    """
+    def __init__(self, factors=(), cofactor: int = 1):
+        super().__init__(factors)
+        self.cofactor = cofactor
+
+    @property
+    def complete(self) -> bool:
+        return self.cofactor == 1
+
+
+_factorizations: OrderedDict[int, Factorization] = OrderedDict()
+FACTORIZATION_CACHE_SIZE = 64
+
+
+def split(n: int, effort: int, seed: int, budget: Budget) -> int | None:
+    """Look for a nontrivial factor of the composite n, spending about twice the time for each unit of effort."""
+    root, exponent = perfect_power(n) or (n, 1)
+    if exponent > 1:
+        return root
+    factor = pollard_rho(n, retries=0, max_steps=1000 << effort, seed=seed)
+    if factor is None and not budget.exhausted:
+        factor = pollard_pm1(n, B=1000 << effort, seed=seed)
+    if factor is None and not budget.exhausted and _ecm_one_factor is not None:
+        try:
+            factor = _ecm_one_factor(n, B1=1000 << effort, B2=100000 << effort, max_curve=4)
+        except ValueError:  # no curve found a factor
+            factor = None
+    return factor
+
+
+def trial_division(n: int, budget: Budget | None = None) -> tuple[Factorization, int]:
+    result = Factorization()
+    for p in primes_upto(TRIAL_DIVISION_BOUND).tolist():
+        if p * p > n or budget is not None and budget.exhausted:
+            break
+        if n % p == 0:
+            # divides by p^2, p^4, ... so that a huge power of p is removed in a few steps
+            result[p] = multiplicity(p, n)
+            n //= p ** result[p]
+    return result, n
+
+
+def factorize(n: int, seconds: float | None = FACTORIZATION_SECONDS) -> Factorization:
+    """
+    Factor n by trial division, then Pollard rho, Pollard p-1 and ECM with
+    growing bounds until the deadline. Results are cached, and the cofactor
+    of a partial result is worked on again the next time n is asked for.
+    """
+    cached = _factorizations.get(n)
+    if cached is not None and cached.complete:
+        _factorizations.move_to_end(n)
+        return cached
+    budget = Budget(seconds=seconds)
+    # trial division of the cofactor again, in case it was cut short by the deadline
+    result, m = trial_division(n if cached is None else cached.cofactor, budget)
+    if cached is not None:
+        for p, e in cached.items():
+            result[p] = result.get(p, 0) + e
+    composites = [m] if m > 1 else []
+    too_big = []
+    effort = attempts = 0
+    while composites and not budget.exhausted:
+        m = composites.pop()
+        if m.bit_length() > SPLIT_MAX_BITS:
+            too_big.append(m)
+            continue
+        # m has no prime factor below TRIAL_DIVISION_BOUND
+        if m < TRIAL_DIVISION_BOUND ** 2 or isprime(m):
+            result[m] = result.get(m, 0) + 1
+            continue
+        started = time.monotonic()
+        factor = split(m, effort, attempts, budget)
+        attempts += 1
+        if factor is None:
+            composites.append(m)
+            # only raise the effort if the next, twice as long, attempt still fits before the deadline
+            remaining = budget.remaining
+            if remaining is None or 2 * (time.monotonic() - started) < remaining:
+                effort += 1
+        else:
+            composites += [int(factor), m // int(factor)]
+    for m in composites + too_big:
+        result.cofactor *= m
+    _factorizations[n] = result
+    _factorizations.move_to_end(n)
+    if len(_factorizations) > FACTORIZATION_CACHE_SIZE:
+        _factorizations.popitem(last=False)
+    return result
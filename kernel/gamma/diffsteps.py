@@ -1,38 +1,118 @@
 import collections
-from functools import reduce
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache, reduce
 
 import sympy
 from sympy.core.function import AppliedUndef
 from sympy.functions.elementary.trigonometric import TrigonometricFunction
 from sympy.strategies.core import switch
 
-from .stepprinter import JSONPrinter, functionnames, replace_u_var
+from .stepprinter import JSONPrinter, Rule, expand_steps, functionnames, replace_u_var
+from .utils import latex_cache
 
 
-def Rule(name, props=""):
-    return collections.namedtuple(name, props + " context symbol")
+class ConstantRule(Rule):
+    __slots__ = ('number',)
 
 
-ConstantRule = Rule("ConstantRule", "number")
-ConstantTimesRule = Rule("ConstantTimesRule", "constant other substep")
-PowerRule = Rule("PowerRule", "base exp")
-AddRule = Rule("AddRule", "substeps")
-MulRule = Rule("MulRule", "terms substeps")
-DivRule = Rule("DivRule", "numerator denominator numerstep denomstep")
-ChainRule = Rule("ChainRule", "substep inner u_var innerstep")
-TrigRule = Rule("TrigRule", "f")
-ExpRule = Rule("ExpRule", "f base")
-LogRule = Rule("LogRule", "arg base")
-FunctionRule = Rule("FunctionRule")
-AlternativeRule = Rule("AlternativeRule", "alternatives")
-DontKnowRule = Rule("DontKnowRule")
-RewriteRule = Rule("RewriteRule", "rewritten substep")
+class ConstantTimesRule(Rule):
+    __slots__ = ('constant', 'other', 'substep')
+    children = ('substep',)
+
+
+class PowerRule(Rule):
+    __slots__ = ('base', 'exp')
+
+
+class AddRule(Rule):
+    __slots__ = ('substeps',)
+    children = ('substeps',)
+
+
+class MulRule(Rule):
+    __slots__ = ('terms', 'substeps')
+    children = ('substeps',)
+
+
+class DivRule(Rule):
+    __slots__ = ('numerator', 'denominator', 'numerstep', 'denomstep')
+    children = ('numerstep', 'denomstep')
+
+
+class ChainRule(Rule):
+    __slots__ = ('substep', 'inner', 'u_var', 'innerstep')
+    children = ('substep', 'innerstep')
+
+
+class TrigRule(Rule):
+    __slots__ = ('f',)
+
+
+class ExpRule(Rule):
+    __slots__ = ('f', 'base')
+
+
+class LogRule(Rule):
+    __slots__ = ('arg', 'base')
+
+
+class FunctionRule(Rule):
+    __slots__ = ()
+
+
+class AlternativeRule(Rule):
+    __slots__ = ('alternatives',)
+    children = ('alternatives',)
+
+
+class DontKnowRule(Rule):
+    __slots__ = ()
+
+
+class RewriteRule(Rule):
+    __slots__ = ('rewritten', 'substep')
+    children = ('substep',)
+
 
 DerivativeInfo = collections.namedtuple('DerivativeInfo', 'expr symbol')
 
 evaluators = {}
 
 
+class StepsMemo:
+    """
+    Rule trees and derivatives computed during one step generation.
+
+    rules -- (type, expr, symbol) to rule, so repeated subexpressions share
+    a single subtree
+
+    derivatives -- id of rule to (rule, derivative); the rule is kept alive so
+    its id can't be reused
+    """
+    def __init__(self):
+        self.rules = {}
+        self.derivatives = {}
+
+
+_memo: ContextVar[StepsMemo | None] = ContextVar('diffsteps_memo', default=None)
+
+
+@contextmanager
+def memoized():
+    """Reuse the active memo, or install a fresh one for the duration of the block."""
+    memo = _memo.get()
+    if memo is not None:
+        yield memo
+        return
+    memo = StepsMemo()
+    token = _memo.set(memo)
+    try:
+        yield memo
+    finally:
+        _memo.reset(token)
+
+
 def evaluates(rule):
     def _evaluates(func):
         func.rule = rule
@@ -266,6 +346,16 @@ def eval_alternative(alternatives, expr, symbol):
 
 
 def diff_steps(expr, symbol):
+    with memoized() as memo:
+        # Float(1) == Integer(1), but they are printed differently
+        key = (type(expr), expr, symbol)
+        rule = memo.rules.get(key)
+        if rule is None:
+            rule = memo.rules[key] = _diff_steps(expr, symbol)
+        return rule
+
+
+def _diff_steps(expr, symbol):
     deriv = DerivativeInfo(expr, symbol)
 
     def key(deriv):
@@ -294,6 +384,16 @@ def diff_steps(expr, symbol):
 
 
 def diff(rule):
+    memo = _memo.get()
+    if memo is None:
+        return _diff(rule)
+    cached = memo.derivatives.get(id(rule))
+    if cached is None:
+        cached = memo.derivatives[id(rule)] = (rule, _diff(rule))
+    return cached[1]
+
+
+def _diff(rule):
     try:
         return evaluators[rule.__class__](*rule)
     except KeyError:
@@ -499,11 +599,7 @@ class DiffPrinter(JSONPrinter):
             self.alternative_functions_printed.add(rule.context.func)
             with self.new_step():
                 self.append(self.format_text("There are multiple ways to do this derivative."))
-                for index, r in enumerate(rule.alternatives[1:]):
-                    with self.new_collapsible():
-                        self.append_header("Method #{}".format(index + 1))
-                        with self.new_level():
-                            self.print_rule(r)
+                self.print_methods(rule.alternatives[1:])
 
     def finalize(self):
         answer = diff(self.rule)
@@ -515,11 +611,22 @@ class DiffPrinter(JSONPrinter):
                     self.append(self.format_text("Now simplify:"))
                     self.append(self.format_math_display(simp))
         return {
-            'content': {'level': self.stack},
+            'content': {'level': self.root},
             'answer': self.format_math_display(answer)
         }
 
 
-def print_json_steps(function, symbol):
-    a = DiffPrinter(diff_steps(function, symbol))
-    return a.finalize()
+@lru_cache(maxsize=16)
+def cached_diff_steps(function, symbol):
+    return diff_steps(function, symbol)
+
+
+def print_json_steps(function, symbol, emit=None, lazy=False):
+    with memoized(), latex_cache():
+        a = DiffPrinter(cached_diff_steps(function, symbol), emit, lazy)
+        return a.finalize()
+
+
+def print_json_substeps(function, symbol, path):
+    with memoized(), latex_cache():
+        return {'content': expand_steps(DiffPrinter, cached_diff_steps(function, symbol), path)}
@@ -254,7 +254,7 @@ exclusive_predicates: list[tuple[Callable[[Any], bool], tuple[str, ...]]] = [
     (is_real, ('pie_chart', 'continued_fraction')),
     # root_to_polynomial
     (is_uncalled_function, ('function_docs',)),
-    (is_matrix, ('matrix_inverse', 'matrix_eigenvals', 'matrix_eigenvectors')),
+    (is_matrix, ('matrix_inverse', 'matrix_eigenvals', 'matrix_eigenvectors', 'determinant', 'rank', 'rref')),
     (is_logic, ('satisfiable', 'truth_table')),
     (is_sum, ('doit',)),
     (is_product, ('doit',)),
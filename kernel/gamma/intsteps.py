@@ -1,11 +1,20 @@
+from collections import OrderedDict
+from contextlib import contextmanager
+
 import sympy
+import sympy.integrals.manualintegrate as manualintegrate
 from sympy.integrals.manualintegrate import (AddRule, AlternativeRule, CompleteSquareRule, ConstantRule,
                                              ConstantTimesRule, CyclicPartsRule, DontKnowRule, ExpRule, PartsRule,
                                              PowerRule, RewriteRule, SqrtQuadraticDenomRule, SqrtQuadraticRule,
                                              TrigRule, TrigSubstitutionRule, URule, _manualintegrate, integral_steps)
 
-from gamma.stepprinter import JSONPrinter, replace_u_var
-from gamma.utils import DerivExpr, latex
+from gamma.stepprinter import JSONPrinter, expand_steps, replace_u_var
+from gamma.utils import Budget, DerivExpr, latex, latex_cache
+
+# default budget of the step search, enough for every integral in the test suite
+INTSTEPS_NODES = 1000
+INTSTEPS_SECONDS = 30
+INTSTEPS_CACHE_SIZE = 16
 
 
 def contains_dont_know(rule):
@@ -35,9 +44,61 @@ def filter_unknown_alternatives(rule):
     return rule
 
 
+def pruning_alternatives(budget: Budget):
+    """
+    Replacement for manualintegrate.alternatives which drops alternatives
+    containing DontKnowRule as soon as they are found, and stops trying
+    further rules once the budget is exhausted and one of them is doable.
+    """
+    def alternatives(*rules):
+        def _alternatives(integral):
+            doable, unknown = [], []
+            for rule in rules:
+                if doable and budget.exhausted:
+                    break
+                result = rule(integral)
+                if not result or isinstance(result, DontKnowRule) or result == integral:
+                    continue
+                if result in doable or result in unknown:
+                    continue
+                if contains_dont_know(result):
+                    unknown.append(result)
+                else:
+                    doable.append(result)
+            alts = doable or unknown
+            if len(alts) == 1:
+                return alts[0]
+            elif alts:
+                return AlternativeRule(alts, *integral)
+        return _alternatives
+    return alternatives
+
+
+# rule trees are namedtuples
+_rules: OrderedDict[tuple, tuple] = OrderedDict()
+
+
+@contextmanager
+def budgeted(budget: Budget):
+    """Make every recursive integral_steps call charge the budget, giving up on a node once it is exhausted."""
+    def _integral_steps(integrand, symbol, **options):
+        if not budget.charge():
+            return DontKnowRule(integrand, symbol)
+        return integral_steps(integrand, symbol, **options)
+
+    alternatives = manualintegrate.alternatives
+    manualintegrate.integral_steps = _integral_steps
+    manualintegrate.alternatives = pruning_alternatives(budget)
+    try:
+        yield budget
+    finally:
+        manualintegrate.integral_steps = integral_steps
+        manualintegrate.alternatives = alternatives
+
+
 class IntegralPrinter(JSONPrinter):
-    def __init__(self, rule):
-        super().__init__(rule)
+    def __init__(self, rule, *args, **kwargs):
+        super().__init__(rule, *args, **kwargs)
         self.u_name = 'u'
         self.u = self.du = None
 
@@ -258,11 +319,7 @@ class IntegralPrinter(JSONPrinter):
             self.alternative_functions_printed.add(rule.context.func)
             with self.new_step():
                 self.append(self.format_text("There are multiple ways to do this integral."))
-                for index, r in enumerate(rule.alternatives):
-                    with self.new_collapsible():
-                        self.append_header("Method #{}".format(index + 1))
-                        with self.new_level():
-                            self.print_rule(r)
+                self.print_methods(rule.alternatives)
 
     def print_TrigSubstitution(self, rule):
         with self.new_step():
@@ -362,14 +419,41 @@ I_n&=\frac{1}{c}(\frac{1}{n-1}(x^{n-1}\sqrt{a+bx+cx^2}-\frac{b}{2}I_{n-1}-cI_n)-
         else:
             answer = None
         return {
-            'content': {'level': self.stack},
+            'content': {'level': self.root},
             'answer': answer
         }
 
 
-def print_json_steps(function, symbol):
-    rule = integral_steps(function, symbol)
+def cached_integral_steps(function, symbol, nodes=INTSTEPS_NODES, seconds=INTSTEPS_SECONDS):
+    """
+    Rule tree of the integral, cached unless the deadline cut it short,
+    since a search stopped by the clock may get further on another try.
+    """
+    key = (function, symbol, nodes, seconds)
+    rule = _rules.get(key)
+    if rule is None:
+        budget = Budget(nodes, seconds)
+        with budgeted(budget):
+            rule = integral_steps(function, symbol)
+        if not budget.timed_out:
+            _rules[key] = rule
+            if len(_rules) > INTSTEPS_CACHE_SIZE:
+                _rules.popitem(last=False)
+    else:
+        _rules.move_to_end(key)
     if isinstance(rule, DontKnowRule):
         raise ValueError("Cannot evaluate integral")
-    a = IntegralPrinter(rule)
-    return a.finalize()
+    return rule
+
+
+def print_json_steps(function, symbol, emit=None, lazy=False):
+    rule = cached_integral_steps(function, symbol)
+    with latex_cache():
+        a = IntegralPrinter(rule, emit, lazy)
+        return a.finalize()
+
+
+def print_json_substeps(function, symbol, path):
+    rule = cached_integral_steps(function, symbol)
+    with latex_cache():
+        return {'content': expand_steps(IntegralPrinter, rule, path)}
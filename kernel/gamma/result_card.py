@@ -1,11 +1,28 @@
-from typing import Any, Callable
+from functools import lru_cache
+from types import CodeType
+from typing import Any, Callable, NamedTuple
 
 import sympy
+from sympy.parsing.sympy_parser import eval_expr, standard_transformations, stringify_expr
 
 from data_type import Dict
 from extension.util import DICT
 from gamma.evaluator import namespace
-from gamma.utils import latex, mathjax_latex
+from gamma.utils import Budget, latex, mathjax_latex
+
+# names standing for the input and the variable in compiled result statements
+INPUT = '_input'
+VARIABLE = '_var'
+# seconds after which the remaining cards of a MultiResultCard are skipped; a card already
+# running is not interrupted, as the sympy calls behind the cards can't be
+MULTI_RESULT_SECONDS = 10
+
+
+@lru_cache(maxsize=256)
+def compile_statement(line: str) -> CodeType:
+    """Parses a result statement once, as parse_expr would, leaving INPUT and VARIABLE as names."""
+    code = stringify_expr(line, {INPUT: None, VARIABLE: None}, namespace, standard_transformations)
+    return compile(code, '<result statement>', 'eval')
 
 
 class ResultCard:
@@ -21,7 +38,7 @@ class ResultCard:
     """
     def __init__(self, title: str, result_statement: str | None, pre_output: Callable[[Any, Any], Any] | None = None,
                  applicable: Callable[[DICT], bool] | None = None,
-                 format_input: Callable[[Any, Any, Any], str | list[str] | None] | None = None,
+                 format_input: Callable[[Any, Any, Any, Any], str | list[str] | None] | None = None,
                  eval_method: Callable[[DICT, DICT | None], Any] | None = None,
                  format_output: Callable[[Any], Dict] | None = None, parameters: list[str] | None = None,
                  wiki: str | None = None):
@@ -35,33 +52,31 @@ class ResultCard:
         self.parameters = parameters
         self.source: str | None = None
         self.wiki = wiki
+        if result_statement is not None and eval_method is None:
+            self.compile({})
+
+    def compile(self, parameters: DICT) -> CodeType:
+        """The result statement with these parameters, compiled once for every input."""
+        parameters = self.default_parameters(dict(parameters))
+        return compile_statement(self.result_statement.format(_var=VARIABLE, **parameters) % INPUT)
 
     def eval(self, components: DICT, parameters):
         if self.eval_method:
             return self.eval_method(components, parameters)
 
-        if parameters is None:
-            parameters = {}
-        else:
-            parameters = parameters.copy()
-
-        parameters = self.default_parameters(parameters)
-
-        for component, val in components.items():
-            parameters[component] = val
-
-        variable = components['variable']
-
-        line = self.result_statement.format(_var=variable, **parameters) % components['input_evaluated']\
-            if self.result_statement is not None else components['expression']
-        return sympy.parse_expr(line, global_dict=namespace)
+        if self.result_statement is None:
+            return sympy.parse_expr(components['expression'], global_dict=namespace)
+        # the input is passed as is, rather than printed and parsed again
+        return eval_expr(self.compile(parameters or {}),
+                         {INPUT: components['input_evaluated'], VARIABLE: components['variable']}, namespace)
 
-    def format_input(self, components: DICT):
-        parameters = self.default_parameters({})
+    def format_input(self, components: DICT, parameters=None):
+        """The statement evaluated with these parameters, or the defaults."""
+        if self._format_input:
+            return self._format_input(self.result_statement, components['input_evaluated'], components, parameters)
+        parameters = self.default_parameters(dict(parameters or {}))
         input_repr = repr(components['input_evaluated'])
         variable = components['variable']
-        if self._format_input:
-            return self._format_input(self.result_statement, input_repr, components)
         return None if self.result_statement is None \
             else self.result_statement.format(_var=variable, **parameters) % input_repr
 
@@ -103,30 +118,50 @@ class ResultCard:
         return data
 
 
+class MultiResult(NamedTuple):
+    """Output of a MultiResultCard, with the components and parameters of its own request."""
+    components: DICT
+    parameters: DICT | None
+    results: list[tuple[ResultCard, Any]]
+
+
 class MultiResultCard(ResultCard):
-    """Tries multiple statements and displays the first that works."""
+    """Tries multiple statements and displays the distinct results of those not skipped."""
 
-    def __init__(self, title, *cards: ResultCard):
+    def __init__(self, title, *cards: ResultCard, seconds: float = MULTI_RESULT_SECONDS):
         super().__init__(title, None, lambda *args: '')
         self.cards = cards
+        self.seconds = seconds
 
-    def eval(self, components: DICT, parameters):
-        results = []
-        for card in self.cards:
-            result = card.eval(components, parameters)
-            if result is not None:
-                if not any(result == r[1] for r in results):
-                    results.append((card, result))
-        # TODO Implicit state is bad, come up with better API
-        # in particular a way to store variable, cards used
-        self.components = components
-        return results
+    def eval_cards(self, components: DICT, parameters, budget: Budget) -> list:
+        """
+        Results of the cards in order, None for those skipped as the seconds have passed.
+        The cards run one after another, as manualintegrate keeps its state in globals and
+        Pyodide has no threads, and a slow card delays the next one rather than being stopped.
+        """
+        return [None if budget.exhausted else card.eval(components, parameters) for card in self.cards]
 
-    def format_output(self, output):
+    def eval(self, components: DICT, parameters) -> MultiResult:
+        results = []
+        seen = set()
+        for card, result in zip(self.cards, self.eval_cards(components, parameters, Budget(seconds=self.seconds))):
+            if result is None:
+                continue
+            try:
+                if result in seen:
+                    continue
+                seen.add(result)
+            except TypeError:  # unhashable
+                if any(result == r for _, r in results):
+                    continue
+            results.append((card, result))
+        return MultiResult(components, parameters, results)
+
+    def format_output(self, output: MultiResult):
         return {
             'type': 'MultiResult',
             'results': [{
-                'input': card.format_input(self.components),
+                'input': card.format_input(output.components, output.parameters),
                 'output': card.format_output(result)
-            } for card, result in output]
+            } for card, result in output.results]
         }
@@ -1,20 +1,25 @@
 import enum
-import itertools
 import sys
-from typing import Any, Callable
+from functools import lru_cache, reduce
+from typing import Any, Callable, NamedTuple
 
 import docutils.core
+import numpy as np
 import sympy
+from sympy.core.sorting import default_sort_key
 from sympy.core.symbol import Symbol
 from sympy.integrals.manualintegrate import manualintegrate
+from sympy.logic.boolalg import Xnor
 
 import gamma.diffsteps
 import gamma.intsteps
 from data_type import Document, FactorDiagram, List, Plot, Reference, Table, TruthTable
-from extension.util import load_with_source, no_undefined_function
+from extension.matrix.util import eigenvals, eigenvects, inverse
+from extension.ntheory.util import factorize
+from extension.util import Latex, format_latex, load_with_source, no_undefined_function
 from gamma.evaluator import eval_node
 from gamma.result_card import MultiResultCard, ResultCard
-from gamma.utils import mathjax_latex
+from gamma.utils import Budget, count_digits, format_long_integer, latex, mathjax_latex, shorten_integer
 
 # Formatting functions
 _function_formatters = {}
@@ -59,15 +64,7 @@ def format_steps(arg):
     return arg
 
 
-def format_long_integer(line, integer, variable):
-    intstr = str(integer)
-    if len(intstr) > 100:
-        # \xe2 is Unicode ellipsis
-        return intstr[:20] + "..." + intstr[len(intstr) - 21:]
-    return line % intstr
-
-
-def format_integral(line, result, components):
+def format_integral(line, result, components, parameters=None):
     if components['limits']:
         limits = ', '.join(map(repr, components['limits']))
     else:
@@ -82,7 +79,10 @@ def format_dict_title(*title: str):
         try:
             fdict = dictionary.items()
             if not any(isinstance(i, Symbol) for i in dictionary):
-                fdict = sorted(fdict)
+                try:
+                    fdict = sorted(fdict)
+                except TypeError:  # complex keys
+                    fdict = sorted(fdict, key=lambda item: default_sort_key(item[0]))
             for key, val in fdict:
                 data['rows'].append([str(key), str(val)])
             return data
@@ -121,7 +121,9 @@ def format_series_fake_title(title, evaluated):
 
 def format_truth_table(table):
     # table is (variables, [(bool, bool...)] representing combination of values
-    # and result
+    # and result, or (variables, summary)
+    if isinstance(table[1], dict):
+        return Table(titles=('Property', 'Value'), rows=[[key, str(value)] for key, value in table[1].items()])
     return TruthTable(titles=[str(s) for s in table[0]] + ["Values"],
                       rows=[[str(v) for v in entry] for entry in table[1]])
 
@@ -131,7 +133,17 @@ def format_approximator(approximation):
     return mathjax_latex(obj, digits=digits)
 
 
+def format_factorization(factors):
+    data = format_dict_title("Factor", "Times")(factors)
+    if not factors.complete:
+        data['rows'].append([shorten_integer(factors.cofactor), 'unfactored'])
+    return data
+
+
 def format_factorization_diagram(factors):
+    if not factors.complete:
+        # a diagram of the factors found would stand for another number
+        raise ValueError("Factorization is not complete")
     primes = []
     for prime in reversed(sorted(factors)):
         times = factors[prime]
@@ -143,7 +155,7 @@ def format_plot(plot_data: tuple[str, list[dict]]):
     return Plot(variable=plot_data[0], graphs=plot_data[1])
 
 
-def format_plot_input(result_statement, input_repr, components):
+def format_plot_input(result_statement, input_evaluated, components, parameters=None):
     if 'input_evaluated' in components:
         functions = components['input_evaluated']
         if isinstance(functions, list):
@@ -152,7 +164,7 @@ def format_plot_input(result_statement, input_repr, components):
             return [f'{y} = {x}' for y, x in functions.items()]
         return None
     else:
-        return 'plot({})'.format(input_repr)
+        return 'plot({})'.format(input_evaluated)
 
 
 class GraphType(enum.Enum):
@@ -247,9 +259,13 @@ def eval_plot(components, parameters=None):
     return repr(variable), graphs
 
 
+def eval_digits(components, parameters=None):
+    return count_digits(int(components['input_evaluated']))
+
+
 def eval_factorization(components, parameters=None):
     number = components["input_evaluated"]
-    return sympy.ntheory.factorint(number)
+    return factorize(int(number))
 
 
 def eval_integral(components, parameters=None):
@@ -262,12 +278,18 @@ def eval_integral_manual(components, parameters=None):
 
 def eval_diffsteps(components, parameters=None):
     function = components.get('function', components['input_evaluated'])
-    return gamma.diffsteps.print_json_steps(function, components['variable'])
+    if parameters and parameters.get('path'):
+        return gamma.diffsteps.print_json_substeps(function, components['variable'], parameters['path'])
+    lazy = bool(parameters and parameters.get('lazy'))
+    return gamma.diffsteps.print_json_steps(function, components['variable'], lazy=lazy)
 
 
 def eval_intsteps(components, parameters=None):
     integrand = components.get('integrand', components['input_evaluated'])
-    return gamma.intsteps.print_json_steps(integrand, components['variable'])
+    if parameters and parameters.get('path'):
+        return gamma.intsteps.print_json_substeps(integrand, components['variable'], parameters['path'])
+    lazy = bool(parameters and parameters.get('lazy'))
+    return gamma.intsteps.print_json_steps(integrand, components['variable'], lazy=lazy)
 
 
 # https://www.python.org/dev/peps/pep-0257/
@@ -303,14 +325,279 @@ def eval_function_docs(components, parameters=None):
                                        settings_overrides={'_disable_config': True})['html_body']
 
 
+# rows shown at most, variables of a table that can be summarized, and of one that can be minimized
+TRUTH_TABLE_ROWS = 1024
+TRUTH_TABLE_SUMMARY_VARIABLES = 28
+TRUTH_TABLE_MINIMAL_VARIABLES = 8
+# a column packs 64 rows into each uint64 word, row 64 * w + j at bit j of word w
+TRUTH_TABLE_CHUNK_WORDS = 2 ** 16
+FULL_WORD = np.uint64(2 ** 64 - 1)
+# the 6 last variables alternate within a word, the others are constant over it
+VARIABLE_WORDS = [np.uint64(sum(1 << j for j in range(64) if not j >> s & 1)) for s in range(6)]
+POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.int64)
+
+bitwise_functions: dict[type, Callable[[list[np.ndarray]], np.ndarray]] = {
+    sympy.And: lambda args: reduce(np.bitwise_and, args),
+    sympy.Or: lambda args: reduce(np.bitwise_or, args),
+    sympy.Xor: lambda args: reduce(np.bitwise_xor, args),
+    sympy.Not: lambda args: ~args[0],
+    sympy.Nand: lambda args: ~reduce(np.bitwise_and, args),
+    sympy.Nor: lambda args: ~reduce(np.bitwise_or, args),
+    Xnor: lambda args: ~reduce(np.bitwise_xor, args),
+    sympy.Implies: lambda args: ~args[0] | args[1],
+    sympy.Equivalent: lambda args: reduce(np.bitwise_and, args) | ~reduce(np.bitwise_or, args),
+    sympy.ITE: lambda args: args[0] & args[1] | ~args[0] & args[2],
+}
+
+
+def compile_boolean(expr, variables: list) -> Callable[[list[np.ndarray]], np.ndarray]:
+    """Function of the packed columns of the variables, raising TypeError if expr isn't propositional."""
+    if expr in variables:
+        i = variables.index(expr)
+        return lambda columns: columns[i]
+    if expr is sympy.true or expr is sympy.false:
+        word = FULL_WORD if expr else np.uint64(0)
+        return lambda columns: np.full(len(columns[0]), word)
+    function = bitwise_functions.get(type(expr))
+    if function is None:
+        raise TypeError(f'{type(expr).__name__} is not propositional')
+    args = [compile_boolean(arg, variables) for arg in expr.args]
+    return lambda columns: function([arg(columns) for arg in args])
+
+
+def variable_columns(words: np.ndarray, n: int) -> list[np.ndarray]:
+    """Columns of n variables over the given words, the first variable being the slowest to change."""
+    columns = []
+    for i in range(n):
+        s = n - 1 - i
+        if s < 6:
+            columns.append(np.full(len(words), VARIABLE_WORDS[s]))
+        else:
+            # words beyond uint64 are Python integers
+            bits = (words >> np.uint64(s - 6)) & np.uint64(1) if words.dtype == np.uint64 else (words >> s - 6) & 1
+            columns.append(np.where(bits.astype(bool), np.uint64(0), FULL_WORD))
+    return columns
+
+
+def row_values(row: int, n: int) -> tuple[bool, ...]:
+    return tuple(not row >> (n - 1 - i) & 1 for i in range(n))
+
+
+def eval_truth_table_rows(expr, variables: list, evaluate, start: int, stop: int) -> list[tuple]:
+    n = len(variables)
+    if evaluate is None:
+        return [combination + (expr.subs(list(zip(variables, combination))),)
+                for combination in (row_values(row, n) for row in range(start, stop))]
+    first, last = start // 64, (stop + 63) // 64
+    words = np.arange(first, last, dtype=np.uint64) if last < 2 ** 64 else np.array(range(first, last), dtype=object)
+    values = np.unpackbits(evaluate(variable_columns(words, n)).astype('<u8').view(np.uint8), bitorder='little')
+    return [row_values(row, n) + (bool(values[row - first * 64]),) for row in range(start, stop)]
+
+
+def count_minterms(expr, variables: list, evaluate) -> int:
+    n = len(variables)
+    if evaluate is None:
+        return sum(bool(expr.subs(list(zip(variables, row_values(row, n))))) for row in range(2 ** n))
+    count = 0
+    total = 2 ** max(n - 6, 0)
+    for start in range(0, total, TRUTH_TABLE_CHUNK_WORDS):
+        values = evaluate(variable_columns(np.arange(start, min(start + TRUTH_TABLE_CHUNK_WORDS, total),
+                                                     dtype=np.uint64), n))
+        if n < 6:
+            values &= np.uint64(2 ** 2 ** n - 1)
+        count += int(POPCOUNT[values.view(np.uint8)].sum())
+    return count
+
+
 def eval_truth_table(components, parameters=None):
+    """
+    Rows from offset to offset + limit, evaluated in bulk over packed columns,
+    or with summary, the counts of rows and terms of the full table.
+    """
     expr = components["input_evaluated"]
     variables = sorted(expr.atoms(sympy.Symbol), key=str)
+    parameters = parameters or {}
+    n = len(variables)
+    try:
+        evaluate = compile_boolean(expr, variables)
+    except TypeError:
+        evaluate = None
+
+    if parameters.get('summary'):
+        if n > TRUTH_TABLE_SUMMARY_VARIABLES:
+            raise ValueError(f'Too many variables to summarize: {n}')
+        minterms = count_minterms(expr, variables, evaluate)
+        summary = {'Variables': n, 'Minterms': minterms, 'Maxterms': 2 ** n - minterms}
+        if n <= TRUTH_TABLE_MINIMAL_VARIABLES:
+            summary['Minimal DNF terms'] = len(sympy.Or.make_args(sympy.to_dnf(expr, simplify=True)))
+            summary['Minimal CNF clauses'] = len(sympy.And.make_args(sympy.to_cnf(expr, simplify=True)))
+        return variables, summary
+
+    offset = max(int(parameters.get('offset', 0)), 0)
+    limit = min(max(int(parameters.get('limit', TRUTH_TABLE_ROWS)), 1), TRUTH_TABLE_ROWS)
+    start, stop = offset, min(offset + limit, 2 ** n)
+    return variables, eval_truth_table_rows(expr, variables, evaluate, start, stop) if start < stop else []
+
+
+# models listed at most, models counted at most, and the seconds either may take
+SATISFIABLE_MODELS = 100
+SATISFIABLE_COUNT_MODELS = 10 ** 5
+SATISFIABLE_SECONDS = 5
+
+
+class ModelCount(NamedTuple):
+    count: int
+    complete: bool
+
+
+class ModelEnumeration:
+    """
+    Models of a formula, found on demand by one solver session that converts
+    the formula to CNF once and blocks every model found before the next one.
+    """
+    def __init__(self, expr):
+        self.variables = sorted(expr.atoms(sympy.Symbol), key=str)
+        self.models: list[dict] = []
+        self.complete = False
+        self._models = sympy.satisfiable(expr, all_models=True)
+
+    def find(self, stop: int, budget: Budget | None = None) -> list[dict]:
+        """The first stop models, or fewer if there aren't so many or the budget runs out."""
+        while len(self.models) < stop and not self.complete:
+            if budget is not None and not budget.charge():
+                break
+            model = next(self._models, False)
+            if model is False:
+                self.complete = True
+            else:
+                self.models.append(model)
+        return self.models[:stop]
+
+
+@lru_cache(maxsize=16)
+def model_enumeration(expr) -> ModelEnumeration:
+    return ModelEnumeration(expr)
+
+
+def eval_satisfiable(components, parameters=None):
+    """
+    A model as satisfiable gives it, models from offset to offset + limit,
+    or with count, the number of models, each within the time budget.
+    """
+    enumeration = model_enumeration(components["input_evaluated"])
+    parameters = parameters or {}
+    if parameters.get('count'):
+        budget = Budget(SATISFIABLE_COUNT_MODELS, SATISFIABLE_SECONDS)
+        count = len(enumeration.find(SATISFIABLE_COUNT_MODELS + 1, budget))
+        return ModelCount(count, enumeration.complete)
+    offset = max(int(parameters.get('offset', 0)), 0)
+    limit = min(max(int(parameters.get('limit', 1)), 1), SATISFIABLE_MODELS)
+    models = enumeration.find(offset + limit, Budget(seconds=SATISFIABLE_SECONDS))[offset:]
+    if offset == 0 and limit == 1:
+        return models[0] if models else False
+    return enumeration.variables, offset, models
+
+
+def format_satisfiable(output):
+    if isinstance(output, ModelCount):
+        count = str(output.count) if output.complete else f'at least {output.count}'
+        return Table(titles=('Property', 'Value'), rows=[['Models', count]])
+    if isinstance(output, tuple):
+        variables, offset, models = output
+        return Table(titles=['Model'] + [str(v) for v in variables],
+                     rows=[[str(offset + i)] + [str(model[v]) for v in variables]
+                           for i, model in enumerate(models, 1)])
+    return format_dict_title('Variable', 'Possible Value')(output)
+
+
+# the default point and order of a series expansion, and the seconds to find its terms
+SERIES_POINT = 0
+SERIES_ORDER = 10
+SERIES_SECONDS = 5
+
+
+def series_parameters(parameters) -> tuple[sympy.Expr, int]:
+    parameters = parameters or {}
+    return sympy.sympify(parameters.get('point', SERIES_POINT)), int(parameters.get('order', SERIES_ORDER))
+
 
-    result = []
-    for combination in itertools.product([True, False], repeat=len(variables)):
-        result.append(combination + (expr.subs(list(zip(variables, combination))),))
-    return variables, result
+def format_series_input(line, input_evaluated, components, parameters=None):
+    point, order = series_parameters(parameters)
+    return line.format(_var=components['variable'], point=point, order=order) % repr(input_evaluated)
+
+
+def series_order(var, point, order: int):
+    """The O term of an expansion to the order, as series gives it."""
+    if point.is_infinite:
+        return sympy.Order(var ** -order, (var, point))
+    return sympy.Order((var - point) ** order, (var, point))
+
+
+class Series(NamedTuple):
+    expansion: sympy.Expr
+    complete: bool  # up to the order, rather than the terms found before the time ran out
+
+
+class SeriesTerms:
+    """
+    Terms of an expansion, found on demand by lseries in increasing order, so that
+    a higher order continues from the last term found rather than starting over.
+    """
+    def __init__(self, expr, var, point):
+        self.var = var
+        self.point = point
+        self.terms: list[sympy.Expr] = []
+        self.complete = False
+        self._terms = expr.lseries(var, point)
+
+    def find(self, order: int, budget: Budget | None = None) -> Series:
+        """
+        The expansion to the order, as series gives it, or the terms found if the budget runs out.
+        A term of lseries can't be interrupted, so the last one may take longer than the budget.
+        """
+        big_o = series_order(self.var, self.point, order)
+        while not self.complete and not (self.terms and big_o.contains(self.terms[-1])):
+            if budget is not None and not budget.charge():
+                return Series(sympy.Add(*self.terms), False)
+            term = next(self._terms, None)
+            if term is None:
+                self.complete = True
+            else:
+                self.terms.append(term)
+        terms = [term for term in self.terms if not big_o.contains(term)]
+        if self.complete and len(terms) == len(self.terms):
+            return Series(sympy.Add(*terms), True)
+        return Series(sympy.Add(*terms, big_o), True)
+
+
+@lru_cache(maxsize=16)
+def series_terms(expr, var, point) -> SeriesTerms:
+    return SeriesTerms(expr, var, point)
+
+
+def eval_series(components, parameters=None):
+    point, order = series_parameters(parameters)
+    terms = series_terms(components['input_evaluated'], components['variable'], point)
+    return terms.find(order, Budget(seconds=SERIES_SECONDS))
+
+
+def format_series(output: Series):
+    if output.complete:
+        return mathjax_latex(output.expansion)
+    return format_latex(Latex().a(latex(output.expansion), R' + \cdots')
+                        .t(' (the terms found before the expansion ran out of time)').f())
+
+
+def eval_matrix_inverse(components, parameters=None):
+    return inverse(components["input_evaluated"])
+
+
+def eval_matrix_eigenvals(components, parameters=None):
+    return eigenvals(components["input_evaluated"])
+
+
+def eval_matrix_eigenvectors(components, parameters=None):
+    return eigenvects(components["input_evaluated"])
 
 
 def eval_approximator(components, parameters=None):
@@ -323,7 +610,8 @@ def eval_approximator(components, parameters=None):
 # Result cards
 
 all_cards: dict[str, ResultCard] = {
-    'result': ResultCard('Result', None, None, format_input=lambda line, result, components: components['expression']),
+    'result': ResultCard('Result', None, None,
+                         format_input=lambda line, result, components, parameters=None: components['expression']),
     'integral': ResultCard(
         "Integral",
         "integrate(%s, {_var})",
@@ -368,22 +656,27 @@ all_cards: dict[str, ResultCard] = {
         format_input=format_integral),
 
     'series': ResultCard(
-        "Series expansion around 0",
-        "series(%s, {_var}, 0, 10)",
-        applicable=no_undefined_function
+        "Series expansion",
+        "series(%s, {_var}, {point}, {order})",
+        applicable=no_undefined_function,
+        format_input=format_series_input,
+        eval_method=eval_series,
+        format_output=format_series,
+        parameters=['order', 'point']
     ),
 
     'digits': ResultCard(
         "Digits in base-10 expansion of number",
         "len(str(%s))",
-        format_input=format_long_integer),
+        format_input=format_long_integer,
+        eval_method=eval_digits),
 
     'factorization': ResultCard(
         "Factors",
         "factorint(%s)",
         applicable=lambda components: components['input_evaluated'] > 0,
         format_input=format_long_integer,
-        format_output=format_dict_title("Factor", "Times"),
+        format_output=format_factorization,
         eval_method=eval_factorization),
 
     'factorizationDiagram': ResultCard(
@@ -463,31 +756,37 @@ all_cards: dict[str, ResultCard] = {
         "Inverse of matrix",
         "(%s).inv()",
         lambda statement, var, *args: sympy.Pow(statement, -1, evaluate=False),
+        eval_method=eval_matrix_inverse
     ),
 
     'matrix_eigenvals': ResultCard(
         "Eigenvalues",
         "(%s).eigenvals()",
+        eval_method=eval_matrix_eigenvals,
         format_output=format_dict_title("Eigenvalue", "Multiplicity")
     ),
 
     'matrix_eigenvectors': ResultCard(
         "Eigenvectors",
         "(%s).eigenvects()",
+        eval_method=eval_matrix_eigenvectors,
         format_output=format_list
     ),
 
     'satisfiable': ResultCard(
         "Satisfiability",
         "satisfiable(%s)",
-        format_output=format_dict_title('Variable', 'Possible Value')
+        eval_method=eval_satisfiable,
+        format_output=format_satisfiable,
+        parameters=['offset', 'limit', 'count']
     ),
 
     'truth_table': ResultCard(
         "Truth table",
         "%s",
         eval_method=eval_truth_table,
-        format_output=format_truth_table
+        format_output=format_truth_table,
+        parameters=['offset', 'limit', 'summary']
     ),
 
     'doit': ResultCard("Result", "(%s).doit()"),
@@ -507,6 +806,9 @@ all_cards: dict[str, ResultCard] = {
     'quadratic_residue': load_with_source('ntheory.quadratic_residue'),
     'english_numeral': load_with_source('elementary.english_numeral'),
     'primitive_root': load_with_source('ntheory.primitive_root'),
+    'determinant': load_with_source('matrix.determinant'),
+    'rank': load_with_source('matrix.rank'),
+    'rref': load_with_source('matrix.rref'),
     'rational': load_with_source('elementary.rational'),
     'pie_chart': load_with_source('elementary.pie_chart'),
     'continued_fraction': load_with_source('ntheory.continued_fraction'),
@@ -1,24 +1,75 @@
 import abc
-import collections
 from contextlib import contextmanager
+from typing import Callable, Iterable, Sequence
 
 import sympy
 
 from gamma.utils import DerivExpr, latex
 
 
-def Rule(name, props=""):
-    # GOTCHA: namedtuple class name not considered!
-    def __eq__(self, other):
-        return self.__class__ == other.__class__ and tuple.__eq__(self, other)
+class Rule:
+    """
+    Node of a step tree.
+
+    Subclasses declare their own fields in __slots__, which come before the
+    context and symbol every rule has, and name the fields holding sub-rules,
+    or lists of sub-rules, in children.
+    """
+    __slots__ = ('context', 'symbol')
+    _fields: tuple[str, ...] = __slots__
+    children: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._fields = tuple(cls.__dict__.get('__slots__', ())) + Rule._fields
 
-    def __neq__(self, other):
-        return not __eq__(self, other)
+    def __init__(self, *args):
+        if len(args) != len(self._fields):
+            raise TypeError("{} takes {} arguments".format(type(self).__name__, len(self._fields)))
+        for field, value in zip(self._fields, args):
+            setattr(self, field, value)
 
-    cls = collections.namedtuple(name, props + " context symbol")
-    cls.__eq__ = __eq__
-    cls.__ne__ = __neq__
-    return cls
+    def __iter__(self):
+        return (getattr(self, field) for field in self._fields)
+
+    def __eq__(self, other):
+        return type(self) is type(other) and tuple(self) == tuple(other)
+
+    def __hash__(self):
+        return hash((type(self), tuple(self)))
+
+    def __repr__(self):
+        return "{}({})".format(type(self).__name__,
+                               ', '.join('{}={!r}'.format(field, value) for field, value in zip(self._fields, self)))
+
+    def _asdict(self):
+        return dict(zip(self._fields, self))
+
+    def substitute(self, old, new, done: dict | None = None):
+        """
+        Substitute old for new in every expression of the tree.
+
+        done -- id of rule to its substituted copy, so subtrees shared by
+        memoized rules are only rebuilt once
+        """
+        done = {} if done is None else done
+        result = done.get(id(self))
+        if result is not None:
+            return result
+        values = []
+        for field, value in zip(self._fields, self):
+            if field in self.children:
+                if isinstance(value, list):
+                    value = [item.substitute(old, new, done) for item in value]
+                else:
+                    value = value.substitute(old, new, done)
+            elif isinstance(value, sympy.Basic):
+                value = value.subs(old, new)
+            elif isinstance(value, tuple):
+                value = tuple(item.subs(old, new) if isinstance(item, sympy.Basic) else item for item in value)
+            values.append(value)
+        result = done[id(self)] = type(self)(*values)
+        return result
 
 
 def functionnames(numterms):
@@ -31,6 +82,9 @@ def functionnames(numterms):
 
 
 def replace_u_var(rule, old_u, new_u):
+    if isinstance(rule, Rule):
+        return rule.substitute(old_u, new_u)
+    # namedtuple rules of sympy.integrals.manualintegrate
     d = rule._asdict()
     for field, val in d.items():
         if isinstance(val, sympy.Basic):
@@ -51,10 +105,31 @@ def replace_u_var(rule, old_u, new_u):
 
 
 class JSONPrinter:
-    def __init__(self, rule):
-        self.alternative_functions_printed = set()
+    """
+    Prints a rule tree into nested JSON nodes.
+
+    emit -- called with every top-level node once it is complete, so steps
+    can be streamed before finalize
+
+    lazy -- print alternative methods as stubs, see expand_steps
+
+    printed -- functions whose alternatives have already been printed
+
+    path -- path of the collapsed method this printer renders, prefixed to
+    the paths of its own stubs
+    """
+    def __init__(self, rule, emit: Callable[[dict], None] | None = None, lazy: bool = False,
+                 printed: Iterable = (), path: Sequence[int] = ()):
+        self.alternative_functions_printed = set(printed)
         self.rule = rule
-        self.stack = []
+        self.emit = emit
+        self.lazy = lazy
+        self.path = list(path)
+        # methods collapsed into stubs, with the functions printed before them
+        self.collapsed: list[tuple[list, frozenset]] = []
+        self.root: list[dict] = []
+        # children of every open node, innermost last
+        self.containers = [self.root]
         self.print_rule(rule)
 
     @abc.abstractmethod
@@ -74,26 +149,44 @@ class JSONPrinter:
             math = latex(math)
         return {'block': math}
 
+    def add_node(self, node: dict):
+        self.containers[-1].append(node)
+        if self.emit and len(self.containers) == 1:
+            self.emit(node)
+
     @contextmanager
-    def new_level(self):
-        index = len(self.stack)
+    def new_node(self, kind: str):
+        body: list[dict] = []
+        node = {kind: body}
+        self.containers[-1].append(node)
+        self.containers.append(body)
         yield
-        self.stack, body = self.stack[:index], self.stack[index:]
-        self.stack.append({'level': body})
+        self.containers.pop()
+        if self.emit and len(self.containers) == 1:
+            self.emit(node)
+
+    def new_level(self):
+        return self.new_node('level')
 
-    @contextmanager
     def new_step(self):
-        index = len(self.stack)
-        yield
-        self.stack, body = self.stack[:index], self.stack[index:]
-        self.stack.append({'step': body})
+        return self.new_node('step')
 
-    @contextmanager
     def new_collapsible(self):
-        index = len(self.stack)
-        yield
-        self.stack, body = self.stack[:index], self.stack[index:]
-        self.stack.append({'collapsible': body})
+        return self.new_node('collapsible')
+
+    def print_methods(self, methods: list):
+        """Print each method in a collapsible, or a stub with its path if lazy."""
+        index = len(self.collapsed)
+        if self.lazy:
+            self.collapsed.append((methods, frozenset(self.alternative_functions_printed)))
+        for i, method in enumerate(methods):
+            with self.new_collapsible():
+                self.append_header("Method #{}".format(i + 1))
+                if self.lazy:
+                    self.add_node({'stub': self.path + [index, i]})
+                else:
+                    with self.new_level():
+                        self.print_rule(method)
 
     @contextmanager
     def new_u_vars(self):
@@ -101,7 +194,22 @@ class JSONPrinter:
         yield self.u, self.du
 
     def append(self, *contents):
-        self.stack.append({'p': contents})
+        self.add_node({'p': contents})
 
     def append_header(self, text):
-        self.stack.append({'header': text})
+        self.add_node({'header': text})
+
+
+def expand_steps(printer_class: type[JSONPrinter], rule, path: Sequence[int]) -> dict:
+    """
+    Lazily print the method a stub stands for.
+
+    path -- pairs of (index of collapsed alternative, index of method), one
+    pair per nesting level, as found in the stub
+    """
+    printer = printer_class(rule, lazy=True)
+    for depth in range(0, len(path), 2):
+        alternative, method = path[depth:depth + 2]
+        methods, printed = printer.collapsed[alternative]
+        printer = printer_class(methods[method], lazy=True, printed=printed, path=path[:depth + 2])
+    return {'level': printer.root}
@@ -1,7 +1,15 @@
 import ast
+import decimal
+import math
 import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
 from typing import cast
 
+import mpmath
+import numpy as np
 import sympy
 from sympy.core.relational import Relational
 from sympy.printing.latex import LatexPrinter
@@ -230,6 +238,151 @@ def removeSymPy(string):
         return string
 
 
+# integers with more digits are shown by their leading and trailing digits
+LONG_INTEGER_DIGITS = 100
+# LaTeX shows integers in full up to this many digits
+FULL_INTEGER_DIGITS = 10 ** 5
+# str() is fast below this, and well within the int to str conversion limit of Python 3.11
+SMALL_INTEGER_BITS = 10000
+# digits of bases up to 36, as in np.base_repr
+DIGITS = np.frombuffer(b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ', dtype=np.uint8)
+
+
+def _log(n: int, prec: int, base: int) -> mpmath.mpf:
+    """Logarithm of n > 0 to base, from its leading prec bits."""
+    shift = max(0, n.bit_length() - prec)
+    with mpmath.workprec(prec + shift.bit_length() + 16):
+        return mpmath.log(n >> shift, base) + shift * mpmath.log(2, base)
+
+
+def count_digits(n: int, base: int = 10) -> int:
+    """Number of digits of |n| in base, exactly, without converting it."""
+    n = abs(n)
+    if n.bit_length() <= SMALL_INTEGER_BITS:
+        return len(int_to_base(n, base))
+    if base & (base - 1) == 0:
+        return -(-n.bit_length() // (base.bit_length() - 1))
+    x = _log(n, 64, base)
+    d = int(mpmath.nint(x))
+    if abs(x - d) > 1e-9:
+        return int(mpmath.floor(x)) + 1
+    return len(_exact_digits(n, base))
+
+
+def leading_digits(n: int, k: int, base: int = 10) -> int:
+    """The number made of the first k digits of |n| in base, exactly."""
+    n = abs(n)
+    d = count_digits(n, base)
+    if d <= k:
+        return n
+    # bits for the k digits, 40 guard bits, and the integer part of the logarithm
+    prec = math.ceil(k * math.log2(base)) + 40 + d.bit_length()
+    with mpmath.workprec(prec):
+        value = mpmath.power(base, _log(n, prec, base) - (d - k))
+        lead = int(mpmath.floor(value))
+        if 1e-6 < value - lead < 1 - 1e-6:
+            return lead
+    return int(_exact_digits(n, base)[:k], base)
+
+
+def trailing_digits(n: int, k: int, base: int = 10) -> str:
+    """The last k digits of |n| in base, with leading zeros."""
+    return int_to_base(abs(n) % base ** k, base).zfill(k)
+
+
+def int_to_str(n: int) -> str:
+    """
+    Decimal representation of n in subquadratic time.
+
+    The binary halves of n are converted recursively and joined with decimal
+    arithmetic, whose multiplication is subquadratic, while str() is
+    quadratic and refuses more than 4300 digits since Python 3.11.
+    """
+    if n.bit_length() <= SMALL_INTEGER_BITS:
+        return str(n)
+    powers: dict[int, decimal.Decimal] = {}
+
+    def convert(m: int, bits: int) -> decimal.Decimal:
+        if bits <= SMALL_INTEGER_BITS:
+            return decimal.Decimal(m)
+        half = bits // 2
+        high = m >> half
+        if half not in powers:
+            powers[half] = decimal.Decimal(2) ** half
+        return convert(high, bits - half) * powers[half] + convert(m - (high << half), half)
+
+    with decimal.localcontext() as context:
+        context.prec = decimal.MAX_PREC
+        context.Emax = decimal.MAX_EMAX
+        return ('-' if n < 0 else '') + str(convert(abs(n), n.bit_length()))
+
+
+def _digits_of_chunks(chunks: list[int], base: int, width: int) -> str:
+    """Write every chunk with width digits at once, dropping the leading zeros of the first."""
+    places = base ** np.arange(width - 1, -1, -1, dtype=np.uint64)
+    digits = np.array(chunks, dtype=np.uint64)[:, None] // places % np.uint64(base)
+    return DIGITS[digits.ravel()].tobytes().decode().lstrip('0') or '0'
+
+
+def int_to_base(n: int, base: int) -> str:
+    """
+    Representation of n in a base from 2 to 36, with the digits of np.base_repr.
+
+    Powers of two are read off the binary representation. Other bases split
+    n by base^(w * 2^i) recursively, down to chunks of w digits that fit in
+    64 bits, which are then written out together.
+    """
+    if not 2 <= base <= 36:
+        raise ValueError(f'Base {base} is not between 2 and 36')
+    if base == 10:
+        return int_to_str(n)
+    sign = '-' if n < 0 else ''
+    n = abs(n)
+    if base in (2, 8, 16):
+        return sign + format(n, {2: 'b', 8: 'o', 16: 'X'}[base])
+    if base & (base - 1) == 0:
+        width = base.bit_length() - 1
+        bits = format(n, 'b')
+        bits = bits.zfill(-(-len(bits) // width) * width)
+        return sign + _digits_of_chunks([int(bits[i:i + width], 2) for i in range(0, len(bits), width)], base, 1)
+    width = int(63 / math.log2(base))
+    powers = [base ** width]
+    while powers[-1] ** 2 <= n:
+        powers.append(powers[-1] ** 2)
+    chunks: list[int] = []
+
+    def split(m: int, i: int, padded: bool):
+        if i < 0:
+            chunks.append(m)
+            return
+        high, low = divmod(m, powers[i])
+        if high or padded:
+            split(high, i - 1, padded)
+        split(low, i - 1, padded or high > 0)
+
+    split(n, len(powers) - 1, False)
+    return sign + _digits_of_chunks(chunks, base, width)
+
+
+@lru_cache(maxsize=2)
+def _exact_digits(n: int, base: int) -> str:
+    """Digits of the rare numbers that are too close to a power of base (times their leading digits) to round."""
+    return int_to_base(n, base)
+
+
+def shorten_integer(n: int, ellipsis: str = '...') -> str:
+    """n in full, or its first 20 and last 21 digits if it is long."""
+    if count_digits(n) <= LONG_INTEGER_DIGITS:
+        return str(n)
+    return ('-' if n < 0 else '') + str(leading_digits(n, 20)) + ellipsis + trailing_digits(n, 21)
+
+
+def format_long_integer(line, integer, components, parameters=None):
+    if isinstance(integer, sympy.Integer) and count_digits(int(integer)) > LONG_INTEGER_DIGITS:
+        return shorten_integer(int(integer))
+    return line % integer
+
+
 class DerivExpr(sympy.Symbol):
     def __new__(cls, name: str):
         return sympy.Symbol.__new__(cls, name, commutative=False)
@@ -239,6 +392,13 @@ class BetaLatexPrinter(LatexPrinter):
     def _print_DerivExpr(self, expr: DerivExpr):
         return R'\mathrm{d}' + self._print_Symbol(expr)
 
+    def _print_int(self, expr: int):
+        if expr.bit_length() <= SMALL_INTEGER_BITS:
+            return super()._print_int(expr)
+        if count_digits(expr) <= FULL_INTEGER_DIGITS:
+            return int_to_str(expr)
+        return shorten_integer(expr, R'\ldots ')
+
 
 printer = BetaLatexPrinter({
     'ln_notation': True,
@@ -247,15 +407,105 @@ printer = BetaLatexPrinter({
 })
 
 
+class Budget:
+    """
+    Limits a search to a number of nodes and a wall-clock time.
+
+    nodes -- the number of nodes that may be charged, None for no limit
+
+    seconds -- the time the search may take from now, None for no limit
+    """
+    def __init__(self, nodes: int | None = None, seconds: float | None = None):
+        self.nodes = nodes
+        self.deadline = None if seconds is None else time.monotonic() + seconds
+        self.spent = 0
+
+    @property
+    def exhausted(self) -> bool:
+        if self.nodes is not None and self.spent > self.nodes:
+            return True
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    @property
+    def timed_out(self) -> bool:
+        """Whether the deadline has passed, which unlike the nodes depends on the machine."""
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+    @property
+    def remaining(self) -> float | None:
+        """Seconds left before the deadline."""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def charge(self) -> bool:
+        """Spend one node, returning whether the search may go on."""
+        self.spent += 1
+        return not self.exhausted
+
+
+class LatexCache:
+    """LaTeX rendered during one request, keyed by expression."""
+
+    def __init__(self):
+        self.entries: dict[tuple[type, sympy.Basic], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, int | float]:
+        return {'hits': self.hits, 'misses': self.misses, 'hit_rate': self.hit_rate}
+
+
+_latex_cache: ContextVar[LatexCache | None] = ContextVar('latex_cache', default=None)
+
+
+@contextmanager
+def latex_cache():
+    """Reuse the active cache, or install a fresh one for the duration of the block."""
+    cache = _latex_cache.get()
+    if cache is not None:
+        yield cache
+        return
+    cache = LatexCache()
+    token = _latex_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _latex_cache.reset(token)
+
+
+_n = sympy.Symbol('_n')
+
+
+def _latex(expr) -> str:
+    if isinstance(expr, sympy.Basic) and expr.has(_n):
+        # solveset(sin(x)) click More Digits
+        expr = expr.replace(_n, sympy.Dummy('n'))  # type: ignore
+    result = printer.doprint(expr)
+    return result.replace(R'\int\limits', R'\int')
+
+
 def latex(expr) -> str:
     # sympy.latex('') == '\\mathtt{\\text{}}'
     if expr == '':
         return ''
-    if isinstance(expr, sympy.Basic):
-        # solveset(sin(x)) click More Digits
-        expr = expr.replace(sympy.Symbol('_n'), sympy.Dummy('n'))  # type: ignore
-    result = printer.doprint(expr)
-    return result.replace(R'\int\limits', R'\int')
+    cache = _latex_cache.get()
+    if cache is None or not isinstance(expr, sympy.Basic):
+        return _latex(expr)
+    # Float(1) == Integer(1), but they are printed differently
+    key = (type(expr), expr)
+    result = cache.entries.get(key)
+    if result is None:
+        cache.misses += 1
+        result = cache.entries[key] = _latex(expr)
+    else:
+        cache.hits += 1
+    return result
 
 
 def is_approximatable_constant(input_evaluated):
@@ -1,18 +1,23 @@
 import re
-from typing import cast
+from typing import Any, cast
 
 from nlp.dispatcher import dispatch
-from nlp.parser import parse
+from nlp.parser import MAX_EVALUATIONS, parse, rank
 
 
-def translate(nl: str) -> str:
+def translate(nl: str, max_evaluations: int = MAX_EVALUATIONS) -> str:
     nl = cast(re.Match, re.fullmatch(r'(.*?)[\s.?]*', nl)).group(1)  # remove trailing .?
     terms = nl.split()  # remove extra space
     entries = dispatch(terms)
     if not entries:
         raise SyntaxError
-    for entry in entries:
-        result = parse(entry, ' '.join(terms))
+    nl = ' '.join(terms)
+    candidates = [(entry, match) for entry in entries if (match := entry[3].fullmatch(nl))]
+    # best first, pattern order among equals
+    candidates.sort(key=lambda candidate: rank(*candidate))
+    memo: dict[str, Any] = {}
+    for entry, match in candidates:
+        result = parse(entry, match, memo, max_evaluations)
         if result:
             return result
     raise ValueError
@@ -1,10 +1,10 @@
-from nlp.pattern import ENTRY, entries
+from nlp.pattern import COMPILED_ENTRY, entries
 
 lex_id = 0
 lex_id_map: dict[str, int] = {}
 rules: list[list[int]] = []
 
-for pattern, target, applicable in entries:
+for pattern, *_ in entries:
     terms = pattern.split()
     rule = []
     for term in terms:
@@ -30,10 +30,52 @@ def rule_match(rule: list[int], ids: list[int]) -> bool:
     return True
 
 
-def dispatch(terms: list[str]) -> list[ENTRY]:
-    patterns = []
+class Matcher:
+    """
+    Matches many rules as subsequences of the ids at once.
+
+    The rules share a trie of keyword ids. The ids are scanned once from
+    left to right, and every trie node reached so far waits in an inverted
+    index under the ids of its children, so that each id only advances the
+    nodes expecting it, whatever the number of rules.
+    """
+    def __init__(self, rules: list[list[int]]):
+        self.children: list[dict[int, int]] = [{}]
+        self.accepts: list[list[int]] = [[]]
+        for i, rule in enumerate(rules):
+            node = 0
+            for _id in rule:
+                child = self.children[node].get(_id)
+                if child is None:
+                    child = self.children[node][_id] = len(self.children)
+                    self.children.append({})
+                    self.accepts.append([])
+                node = child
+            self.accepts[node].append(i)
+
+    def match(self, ids: list[int]) -> list[int]:
+        """Indices of the rules that are subsequences of ids, in order."""
+        matched = list(self.accepts[0])
+        root = self.children[0]
+        started: set[int] = set()
+        waiting: dict[int, list[int]] = {}
+        for _id in ids:
+            nodes = waiting.pop(_id, [])
+            # the first occurrence is the best place to start, as for every later keyword
+            if _id in root and _id not in started:
+                started.add(_id)
+                nodes.append(0)
+            for node in nodes:
+                child = self.children[node][_id]
+                matched += self.accepts[child]
+                for key in self.children[child]:
+                    waiting.setdefault(key, []).append(child)
+        return sorted(matched)
+
+
+matcher = Matcher(rules)
+
+
+def dispatch(terms: list[str]) -> list[COMPILED_ENTRY]:
     ids = [lex_id_map.get(term.lower(), -1) for term in terms]
-    for rule, pattern in zip(rules, entries):
-        if rule_match(rule, ids):
-            patterns.append(pattern)
-    return patterns
+    return [entries[i] for i in matcher.match(ids)]
@@ -1,21 +1,55 @@
 import re
+from typing import Any
 
 from gamma.logic import SymPyGamma
-from nlp.pattern import ENTRY
+from nlp.pattern import COMPILED_ENTRY
 
+# distinct groups evaluated by SymPy for one query
+MAX_EVALUATIONS = 8
+brackets = {')': '(', ']': '[', '}': '{'}
 
-def parse(entry: ENTRY, nl: str) -> str | None:
-    pattern, template, applicable = entry
-    re_pattern = pattern.replace(R'\expr', '(.*)')
-    match = re.fullmatch(re_pattern, nl, re.IGNORECASE)
-    if match is None:
-        return None
+
+def plausible(text: str) -> bool:
+    """Whether text may be an expression at all: not blank, with balanced brackets."""
+    if not text.strip():
+        return False
+    stack = []
+    for c in text:
+        if c in '([{':
+            stack.append(c)
+        elif c in brackets and (not stack or stack.pop() != brackets[c]):
+            return False
+    return not stack
+
+
+def rank(entry: COMPILED_ENTRY, match: re.Match) -> tuple[int, int, int]:
+    """Sort key of a candidate parse: more keywords matched, then fewer groups, then shorter groups."""
+    groups = match.groups()
+    return len(groups) - len(entry[0].split()), len(groups), sum(map(len, groups))
+
+
+def parse(entry: COMPILED_ENTRY, match: re.Match, memo: dict[str, Any] | None = None,
+          max_evaluations: int = MAX_EVALUATIONS) -> str | None:
+    """
+    memo maps group text to its evaluation, shared by the candidates of the same query,
+    and no group is evaluated once it holds max_evaluations of them.
+    """
+    template, applicable = entry[1:3]
     groups = match.groups()
     if len(groups) != template.count('$'):
         return None
-    parsed = [SymPyGamma(group).evaluated for group in groups]
-    if applicable and not applicable(*parsed):
-        return None
+    if applicable:
+        if not all(map(plausible, groups)):
+            return None
+        if memo is None:
+            memo = {}
+        for group in groups:
+            if group not in memo:
+                if len(memo) >= max_evaluations:
+                    return None
+                memo[group] = SymPyGamma(group).evaluated
+        if not applicable(*(memo[group] for group in groups)):
+            return None
     result = template
     for i in range(len(groups)):
         result = result.replace(f'(${i})', f'({groups[i]})')
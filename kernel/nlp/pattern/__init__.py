@@ -3,7 +3,7 @@ import re
 from .algebra import entries as algebra_entries
 from .calculus import entries as calculus_entries
 from .ntheory import entries as ntheory_entries
-from .util import ENTRY
+from .util import COMPILED_ENTRY, ENTRY
 
 
 def expand(entry: ENTRY) -> list[ENTRY]:
@@ -18,7 +18,12 @@ def expand(entry: ENTRY) -> list[ENTRY]:
     return [entry]
 
 
-entries: list[ENTRY] = [expanded_entry for entries in (
+def compile_entry(entry: ENTRY) -> COMPILED_ENTRY:
+    pattern, target, applicable = entry
+    return pattern, target, applicable, re.compile(pattern.replace(R'\expr', '(.*)'), re.IGNORECASE)
+
+
+entries: list[COMPILED_ENTRY] = [compile_entry(expanded_entry) for entries in (
     ntheory_entries,
     algebra_entries,
     calculus_entries
@@ -1,8 +1,11 @@
+import re
 from typing import Callable
 
 import sympy
 
 ENTRY = tuple[str, str, Callable | None]
+# with the regex of the pattern, \expr capturing a group
+COMPILED_ENTRY = tuple[str, str, Callable | None, re.Pattern]
 
 
 def is_integer(n):
@@ -23,6 +23,7 @@ setup(
         'api', 'data_type', 'nlp', 'nlp/pattern', 'gamma', 'extension',
         'extension/elementary',
         'extension/equation',
+        'extension/matrix',
         'extension/ntheory',
         'extension/plot',
     ],
@@ -1,9 +1,15 @@
 import hashlib
 import json
+import time
 
 import pytest
+from sympy import Dummy, O, S, exp, pi, series, sin
+from sympy.abc import x
 
 from api import eval_card
+from gamma.result_card import MultiResultCard, ResultCard
+from gamma.resultsets import TRUTH_TABLE_ROWS, Series, SeriesTerms, get_card
+from gamma.utils import Budget
 
 cases = [
     (('digits', '12', None, None),
@@ -36,6 +42,23 @@ cases = [
                ['True', 'False', 'False'],
                ['False', 'True', 'False'],
                ['False', 'False', 'False']], 'titles': ['x', 'y', 'Values'], 'type': 'TruthTable'}),
+    (('truth_table', 'Xor(Implies(a, b), c)', None, {'offset': 3, 'limit': 2}),
+     {'rows': [['True', 'False', 'False', 'False'],
+               ['False', 'True', 'True', 'False']], 'titles': ['a', 'b', 'c', 'Values'], 'type': 'TruthTable'}),
+    (('truth_table', 'x | y', None, {'offset': 4}),
+     {'rows': [], 'titles': ['x', 'y', 'Values'], 'type': 'TruthTable'}),
+    (('truth_table', '(x | y) & (x | ~y) & (~x | y)', None, {'summary': True}),
+     {'rows': [['Variables', '2'], ['Minterms', '1'], ['Maxterms', '3'], ['Minimal DNF terms', '1'],
+               ['Minimal CNF clauses', '2']], 'titles': ('Property', 'Value'), 'type': 'Table'}),
+    (('truth_table', 'Xor(*symbols("a:z"))', None, {'offset': 2 ** 25 - 1, 'limit': 1}),
+     {'rows': [['True'] + ['False'] * 25 + ['True']], 'titles': list('abcdefghijklmnopqrstuvwxyz') + ['Values'],
+      'type': 'TruthTable'}),
+    (('satisfiable', '~x', None, None),
+     {'rows': [['x', 'False']], 'titles': ('Variable', 'Possible Value'), 'type': 'Table'}),
+    (('satisfiable', 'x | y', None, {'count': True}),
+     {'rows': [['Models', '3']], 'titles': ('Property', 'Value'), 'type': 'Table'}),
+    (('satisfiable', 'x & ~x', None, {'count': True}),
+     {'rows': [['Models', '0']], 'titles': ('Property', 'Value'), 'type': 'Table'}),
     (('polar_angle',  'sqrt(3)+i', None, None),
      {'tex': '0.523598775598299', 'type': 'Tex'}),
     (('function_docs', 'factorial2', None, None),
@@ -83,6 +106,34 @@ def test(args: tuple, expected: dict):
     assert actual == expected
 
 
+def test_truth_table_limit():
+    # the limit is capped at the default page
+    assert len(eval_card('truth_table', 'Xor(*symbols("a:z"))', None, {'limit': 10 ** 9})['rows']) == TRUTH_TABLE_ROWS
+
+
+def test_truth_table_offset():
+    # a negative offset starts at the first row
+    first = eval_card('truth_table', 'x & y', None, {'limit': 2})
+    assert eval_card('truth_table', 'x & y', None, {'offset': -100, 'limit': 2})['rows'] == first['rows']
+
+
+def test_satisfiable_models():
+    # the order of models depends on the solver
+    first = eval_card('satisfiable', 'x | y', None, {'limit': 1})
+    rest = eval_card('satisfiable', 'x | y', None, {'offset': 1, 'limit': 5})
+    assert rest['titles'] == ['Model', 'x', 'y']
+    assert [row[0] for row in rest['rows']] == ['2', '3']
+    models = {tuple(row[1:]) for row in rest['rows']} | {tuple(value for _, value in sorted(first['rows']))}
+    assert models == {('True', 'True'), ('True', 'False'), ('False', 'True')}
+
+
+def test_satisfiable_offset():
+    # a negative offset starts at the first model
+    actual = eval_card('satisfiable', 'x | y', None, {'offset': -1, 'limit': 2})
+    assert [row[0] for row in actual['rows']] == ['1', '2']
+    assert actual['rows'] == eval_card('satisfiable', 'x | y', None, {'limit': 2})['rows']
+
+
 def test_plot():
     actual = eval_card('plot', 'x', 'x', {'xmin': 10, 'xmax': 30})
     assert actual['type'] == 'Plot'
@@ -112,3 +163,46 @@ integrate_step_cases = [
 def test_integrate_step(expr: str, expected: bytes):
     actual = eval_card('intsteps', f'integrate({expr})', 'x', None)
     assert hashlib.md5(json.dumps(actual).encode()).digest() == expected
+
+
+def test_result_statement():
+    # the input is used as is, without printing and parsing it again
+    d = Dummy('d')
+    assert get_card('diff').eval({'input_evaluated': d ** 3, 'variable': d}, None) == 3 * d ** 2
+    assert get_card('float_approximation').eval({'input_evaluated': pi, 'variable': None}, {'digits': 30}) \
+        == pi.evalf(30)
+
+
+def test_multi_result():
+    fast = ResultCard('Fast', None, eval_method=lambda components, parameters: x + 1)
+    same = ResultCard('Same', None, eval_method=lambda components, parameters: 1 + x)
+    slow = ResultCard('Slow', None, eval_method=lambda components, parameters: time.sleep(0.5) or x)
+    late = ResultCard('Late', None, eval_method=lambda components, parameters: x + 2)
+    # duplicates are dropped, the slow card runs to the end and the cards after it are skipped
+    assert MultiResultCard('Forms', fast, same, slow, late, seconds=0.2).eval({}, None).results \
+        == [(fast, x + 1), (slow, x)]
+
+
+def test_series():
+    card = get_card('series')
+    components = {'input_evaluated': exp(sin(x)), 'variable': x}
+    assert card.format_input(components) == 'series(exp(sin(x)), x, 0, 10)'
+    assert card.format_input(components, {'order': '4', 'point': 'pi'}) == 'series(exp(sin(x)), x, pi, 4)'
+    assert card.eval(components, None) == Series(series(exp(sin(x)), x, 0, 10), True)
+    assert card.eval({'input_evaluated': sin(x), 'variable': x}, {'order': 4, 'point': 'pi'}) \
+        == Series(series(sin(x), x, pi, 4), True)
+    assert card.eval({'input_evaluated': x ** 3 + x, 'variable': x}, {'order': 2}) == Series(x + O(x ** 2), True)
+    assert card.eval({'input_evaluated': x ** 3 + x, 'variable': x}, None) == Series(x ** 3 + x, True)
+
+
+def test_series_terms():
+    terms = SeriesTerms(exp(x), x, S.Zero)
+    assert terms.find(3) == Series(series(exp(x), x, 0, 3), True)
+    found = list(terms.terms)
+    # a lower order is taken from the terms found, a higher one continues from them
+    assert terms.find(2) == Series(series(exp(x), x, 0, 2), True)
+    assert terms.terms == found
+    assert terms.find(5) == Series(series(exp(x), x, 0, 5), True)
+    assert terms.terms[:len(found)] == found
+    # out of time, the terms found so far
+    assert terms.find(10, Budget(seconds=0)) == Series(series(exp(x), x, 0, 5).removeO() + x ** 5 / 120, False)
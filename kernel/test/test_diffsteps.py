@@ -0,0 +1,57 @@
+import pytest
+from sympy import Symbol, cos, simplify, sin
+
+from gamma.diffsteps import diff, diff_steps, memoized, print_json_steps
+from gamma.stepprinter import replace_u_var
+
+x = Symbol('x')
+u = Symbol('u')
+
+
+def nested_chain(depth: int):
+    # sin(f) + cos(f) doubles the expression tree at every level, but only adds 3 distinct subexpressions
+    f = x**2
+    for _ in range(depth):
+        f = sin(f) + cos(f)
+    return f
+
+
+def test_shared_subtree():
+    rule = diff_steps(sin(x**2) / (1 + sin(x**2)), x)
+    assert rule.numerstep is rule.denomstep.substeps[1]
+
+
+def test_nested_chain_result():
+    function = nested_chain(3)
+    assert simplify(diff(diff_steps(function, x)) - function.diff(x)) == 0
+
+
+@pytest.mark.parametrize('depth', [5, 10, 20])
+def test_nested_chain_benchmark(depth: int):
+    with memoized() as memo:
+        diff(diff_steps(nested_chain(depth), x))
+    assert len(memo.rules) == 3 * depth + 1
+    assert len(memo.derivatives) == 5 * depth + 1
+
+
+def test_emit():
+    emitted: list[dict] = []
+    steps = print_json_steps(sin(x**2) * cos(x), x, emitted.append)
+    assert emitted == steps['content']['level']
+
+
+def test_replace_u_var():
+    rule = diff_steps(sin(x**2) / (1 + sin(x**2)), x)
+    replaced = replace_u_var(rule, x, u)
+    assert not hasattr(replaced, '__dict__')
+    assert replaced.context == sin(u**2) / (1 + sin(u**2))
+    assert replaced.numerstep is replaced.denomstep.substeps[1]
+    assert replace_u_var(replaced, u, x) == rule
+
+
+@pytest.mark.parametrize('depth', [10, 20])
+def test_replace_u_var_benchmark(depth: int):
+    # substituting must visit shared subtrees once, not once per path through them
+    with memoized():
+        rule = diff_steps(nested_chain(depth), x)
+    assert replace_u_var(rule, x, u).context == nested_chain(depth).subs(x, u)
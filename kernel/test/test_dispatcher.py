@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from nlp.dispatcher import Matcher, lex_id_map, matcher, rule_match, rules
+
+words = sorted(lex_id_map)
+
+
+def brute_force(rules: list[list[int]], ids: list[int]) -> list[int]:
+    return [i for i, rule in enumerate(rules) if rule_match(rule, ids)]
+
+
+@pytest.mark.parametrize('rule, ids, expected', [
+    ([], [], True),
+    ([1], [], False),
+    ([1, 1], [1], False),
+    ([1, 1], [2, 1, 1], True),
+    ([1, 2], [2, 1], False),
+    ([1, 2, 1], [1, 1, 2, 2, 1], True),
+])
+def test_match(rule: list[int], ids: list[int], expected: bool):
+    assert rule_match(rule, ids) == expected
+    assert Matcher([rule]).match(ids) == ([0] if expected else [])
+
+
+def test_patterns():
+    rng = random.Random(0)
+    for _ in range(1000):
+        ids = [lex_id_map.get(rng.choice(words), -1) for _ in range(rng.randint(0, 8))]
+        assert matcher.match(ids) == brute_force(rules, ids)
+
+
+def test_synthetic_rules():
+    rng = random.Random(0)
+    synthetic_rules = [[rng.randrange(300) for _ in range(rng.randint(0, 5))] for _ in range(5000)]
+    queries = [[rng.randrange(-1, 300) for _ in range(rng.randint(0, 12))] for _ in range(100)]
+    synthetic_matcher = Matcher(synthetic_rules)
+    assert [synthetic_matcher.match(ids) for ids in queries] == [brute_force(synthetic_rules, ids) for ids in queries]
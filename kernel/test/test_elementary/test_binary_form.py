@@ -1,5 +1,19 @@
+import pytest
+
 from api import eval_card
 
 
 def test():
     assert eval_card('binary_form', '1231', None, None)['tex'] == '10011001111_2'
+
+
+@pytest.mark.parametrize('number, base, expected', [
+    ('1231', 8, '2317_8'),
+    ('1231', 16, '4CF_{16}'),
+    ('2**64', 36, '3W5E11264SGSG_{36}'),
+    ('0', 3, '0_3'),
+    ('2**1000', 32, R'10000000000000000000\ldots 000000000000000000000_{32}\ (201\text{ digits})'),
+    ('3**1000000', 3, R'10000000000000000000\ldots 000000000000000000000_3\ (1000001\text{ digits})'),
+])
+def test_base(number: str, base: int, expected: str):
+    assert eval_card('binary_form', number, None, {'base': base})['tex'] == expected
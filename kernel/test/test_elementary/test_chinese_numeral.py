@@ -1,7 +1,7 @@
 import pytest
 
 from api import eval_card
-from extension.elementary.chinese_numeral import MAX
+from extension.elementary.chinese_numeral import COMPOUND_MAX
 
 cases = [
     (0, '〇', '零'),
@@ -17,7 +17,14 @@ cases = [
     (10357, '一万〇三百五十七', '壹萬零叁佰伍拾柒'),
     (100000000, '一亿', '壹億'),
     (102304567, '一亿〇二百三十万四千五百六十七', '壹億零贰佰叁拾萬肆仟伍佰陆拾柒'),
-    (MAX, '九千九百九十九万九千九百九十九亿九千九百九十九万九千九百九十九', '玖仟玖佰玖拾玖萬玖仟玖佰玖拾玖億玖仟玖佰玖拾玖萬玖仟玖佰玖拾玖')
+    (100000010, '一亿〇一十', '壹億零壹拾'),
+    (10 ** 12, '一万亿', '壹萬億'),
+    (10000010000000, '十万亿一千万', '壹拾萬億壹仟萬'),
+    (COMPOUND_MAX - 1, '九千九百九十九万九千九百九十九亿九千九百九十九万九千九百九十九', '玖仟玖佰玖拾玖萬玖仟玖佰玖拾玖億玖仟玖佰玖拾玖萬玖仟玖佰玖拾玖'),
+    (10 ** 16 + 1, '一京〇一', '壹京零壹'),
+    (10 ** 40 + 10 ** 36, '一正〇一涧', '壹正零壹澗'),
+    (10 ** 88 + 1, '一载载〇一', '壹載載零壹'),
+    (10 ** 48 + 10 ** 4, '一万载〇一万', '壹萬載零壹萬'),
 ]
 
 
@@ -5,6 +5,12 @@ from api import eval_card
 cases = [
     (0, 'zero'),
     (1231628, 'one million, two hundred and thirty-one thousand, six hundred and twenty-eight'),
+    (1000000050, 'one billion and fifty'),
+    (10 ** 36 + 1100, 'one undecillion, one thousand, one hundred'),
+    (10 ** 303, 'one centillion'),
+    (10 ** 306, 'one uncentillion'),
+    (16 * 10 ** 351, 'sixteen sedecicentillion'),
+    (10 ** 3003, 'one millinillion'),
 ]
 
 
@@ -6,6 +6,9 @@ card_cases = [
     (1568, 'MDLXVIII'),
     (2470, 'MMCDLXX'),
     (3999, 'MMMCMXCIX'),
+    (4000, R'\overline{IV}'),
+    (12345, R'\overline{XII}CCCXLV'),
+    (1001001, R'\overline{\overline{I}}\overline{I}I'),
 ]
 
 
@@ -1,6 +1,11 @@
 import pytest
+from sympy import FiniteSet, Float, Rational, cos, exp, lambdify, log, sin, tan
+from sympy.abc import x
 
 from api import eval_card
+from extension.equation.single_variable_equation import (Roots, brackets, format_solution, numeric_roots, root_bound,
+                                                         root_grid)
+from gamma.utils import Budget
 
 cases = [
     ('x^3+2',
@@ -8,6 +13,15 @@ cases = [
      R'\frac{\sqrt[3]{2}}{2} - \frac{\sqrt[3]{2} \sqrt{3} i}{2}, '
      R'\frac{\sqrt[3]{2}}{2} + \frac{\sqrt[3]{2} \sqrt{3} i}{2}\right\}'),
     ('Heaviside(x)', R'\text{Real root: }x \in\left(-\infty, 0\right)'),
+    # solveset leaves a ConditionSet, so roots are found numerically, and are every root
+    # if as many as Rolle's theorem allows
+    ('cos(x) - x', R'\text{Some real roots in }\left[-1000000, 1000000\right]\text{, numeric to 15 digits: }'
+     R'\left\{0.739085133215161\right\}'),
+    ('log(x) + x', R'\text{Real root, numeric to 15 digits: }x \in\left\{0.567143290409784\right\}'),
+    ('Eq(exp(x), x + 2)',
+     R'\text{Real root, numeric to 15 digits: }x \in\left\{-1.84140566043696, 1.14619322062058\right\}'),
+    ('exp(x) + x**2 + 1', R'\text{Complex root: }x \in\left\{x\; \middle|\; x \in \mathbb{C} '
+     R'\wedge x^{2} + e^{x} + 1 = 0 \right\}'),
 ]
 
 
@@ -15,3 +29,32 @@ cases = [
 def test(equation: str, expected: str):
     actual = eval_card('root', equation, 'x', None)['tex']
     assert actual == expected
+
+
+def test_numeric_roots():
+    assert [str(root) for root in numeric_roots(exp(x) - 3 * x, x, 30, Budget())] == [
+        '0.619061286735945112152326994021', '1.51213455165784247389673967807']
+    # the sign changes across the pole, but findroot doesn't converge there
+    assert len(brackets(lambdify(x, 1 / (x - Rational(1, 3)), 'numpy'), root_grid())) == 1
+    assert numeric_roots(1 / (x - Rational(1, 3)), x, 15, Budget()) == []
+    # the roots closest to 0 come first
+    assert [str(root) for root in numeric_roots(tan(x) - 2, x, 15, Budget(nodes=1))] == ['1.10714871779409']
+
+
+def test_root_count():
+    # every root of sin(x) = x/1000 is in [-1000, 1000], and it has 635
+    assert len(numeric_roots(sin(x) - x / 1000, x, 15, Budget())) == 635
+    assert root_bound(sin(x) - x / 1000, x) is None
+    assert root_bound(exp(x) - 3 * x, x) == 2
+    assert root_bound(log(x) + x, x) == 1
+    # Rolle's theorem needs one interval where the equation is continuous, and a derivative with finitely many roots
+    assert root_bound(tan(x) - x, x) is None
+    assert root_bound(cos(x) - x, x) is None
+
+
+def test_partial():
+    # roots found before the deadline are not the whole solution
+    output = format_solution(Roots(FiniteSet(Float('1.10714871779409', 15)), x, False, 15, True, False))
+    assert output['tex'] == (R'\text{Some real roots in }\left[-1000000, 1000000\right]'
+                             R'\text{, numeric to 15 digits, before the search ran out of time: }'
+                             R'\left\{1.10714871779409\right\}')
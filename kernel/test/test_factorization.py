@@ -0,0 +1,39 @@
+from math import prod
+
+import pytest
+from sympy import factorint, nextprime
+
+from api import eval_card
+from extension.ntheory.util import SPLIT_MAX_BITS, Factorization, factorize
+from gamma.resultsets import format_factorization_diagram
+
+p29, p30 = nextprime(10**29), nextprime(10**30)
+
+
+@pytest.mark.parametrize('n', [1, 12, 3840, 2**64 + 1, nextprime(10**6)**3 * 7,
+                               nextprime(10**12) * nextprime(10**13)])
+def test_complete(n: int):
+    factors = factorize(int(n))
+    assert factors.complete
+    assert factors == factorint(n)
+    assert factorize(int(n)) is factors
+
+
+def test_partial():
+    # too big to split, so it stays unfactored without a deadline
+    m = (2 ** (SPLIT_MAX_BITS + 1) + 1) ** 2
+    factors = factorize(12 * m, seconds=None)
+    assert not factors.complete
+    assert factors[2] == 2 and factors[3] >= 1
+    assert prod(p ** e for p, e in factors.items()) * factors.cofactor == 12 * m
+    assert factors.cofactor.bit_length() > SPLIT_MAX_BITS
+
+
+def test_diagram_partial():
+    with pytest.raises(ValueError):
+        format_factorization_diagram(Factorization({2: 2, 3: 1}, p29 * p30))
+
+
+def test_card_unfactored():
+    actual = eval_card('factorization', str(12 * p29 * p30), None, None)
+    assert actual['rows'] == [['2', '2'], ['3', '1'], [str(p29 * p30), 'unfactored']]
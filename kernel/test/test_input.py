@@ -20,7 +20,7 @@ python_cases = [
       {'name': 'chinese_numeral', 'title': 'Chinese numeral', 'source': 'extension/elementary/chinese_numeral.py',
        'wiki': 'Chinese_numerals'},
       {'name': 'binary_form', 'title': 'Binary form', 'input': 'np.base_repr(12)', 'wiki': 'Binary_number',
-       'source': 'extension/elementary/binary_form.py'},
+       'parameters': ['base'], 'source': 'extension/elementary/binary_form.py'},
       {'name': 'factorization', 'title': 'Factors', 'input': 'factorint(12)'},
       {'name': 'factorizationDiagram', 'title': 'Factorization Diagram',
        'input': 'factorint(12)'},
@@ -59,7 +59,8 @@ python_cases = [
       {'name': 'diff', 'variable': 'x', 'title': 'Derivative', 'input': 'diff(sin(2*x), x)',
        'pre_output': R'\frac{\mathrm{d}}{\mathrm{d} x} \sin{\left(2 x \right)}'},
       {'name': 'integral_alternate', 'variable': 'x', 'title': 'Antiderivative forms', 'pre_output': ''},
-      {'name': 'series', 'variable': 'x', 'title': 'Series expansion around 0', 'input': 'series(sin(2*x), x, 0, 10)'}
+      {'name': 'series', 'variable': 'x', 'title': 'Series expansion', 'input': 'series(sin(2*x), x, 0, 10)',
+       'parameters': ['order', 'point']}
       ]),
     ('limit(tan(x), x, pi/2)',
      [{'title': 'SymPy', 'input': 'limit(tan(x),x,pi/2)',
@@ -178,7 +179,8 @@ python_cases = [
       {'name': 'diff', 'title': 'Derivative', 'input': 'diff(x + y, x)', 'variable': 'x',
        'pre_output': R'\frac{\partial}{\partial x} \left(x + y\right)'},
       {'name': 'integral_alternate', 'title': 'Antiderivative forms', 'variable': 'x', 'pre_output': ''},
-      {'name': 'series', 'title': 'Series expansion around 0', 'input': 'series(x + y, x, 0, 10)', 'variable': 'x'}]),
+      {'name': 'series', 'title': 'Series expansion', 'input': 'series(x + y, x, 0, 10)', 'variable': 'x',
+       'parameters': ['order', 'point']}]),
     ('f(x)',
      [{'title': 'SymPy', 'input': "Function('f')(x)", 'output': {'type': 'Tex', 'tex': R'f{\left(x \right)}'}},
       {'name': 'diff', 'title': 'Derivative', 'input': 'diff(f(x), x)', 'variable': 'x',
@@ -197,8 +199,8 @@ python_cases = [
       {'name': 'diff', 'title': 'Derivative', 'input': 'diff(Heaviside(x), x)', 'variable': 'x',
        'pre_output': R'\frac{\mathrm{d}}{\mathrm{d} x} \theta\left(x\right)'},
       {'name': 'integral_alternate', 'title': 'Antiderivative forms', 'variable': 'x', 'pre_output': ''},
-      {'name': 'series', 'title': 'Series expansion around 0', 'input': 'series(Heaviside(x), x, 0, 10)',
-       'variable': 'x'}]),
+      {'name': 'series', 'title': 'Series expansion', 'input': 'series(Heaviside(x), x, 0, 10)',
+       'variable': 'x', 'parameters': ['order', 'point']}]),
     ('Limit(tan(x), x, pi/2)',
      [{'title': 'SymPy', 'input': 'Limit(tan(x),x,pi/2)',
        'output': {'type': 'Tex', 'tex': R'\lim_{x \to \frac{\pi}{2}} \tan{\left(x \right)}'}},
@@ -0,0 +1,77 @@
+import pytest
+import sympy.integrals.manualintegrate as manualintegrate
+from sympy import Symbol, cos, exp, sec, simplify, sin, tan
+
+from api import eval_card
+from gamma import intsteps
+from gamma.utils import Budget
+
+x = Symbol('x')
+
+
+def stubs(node) -> list:
+    if isinstance(node, dict):
+        if 'stub' in node:
+            return [node['stub']]
+        return [path for value in node.values() for path in stubs(value)]
+    if isinstance(node, list):
+        return [path for value in node for path in stubs(value)]
+    return []
+
+
+def expand(node, function):
+    # replace every stub with the level it stands for, recursively
+    if isinstance(node, dict):
+        if 'stub' in node:
+            return expand(intsteps.print_json_substeps(function, x, node['stub'])['content'], function)
+        return {key: expand(value, function) for key, value in node.items()}
+    if isinstance(node, list):
+        return [expand(value, function) for value in node]
+    return node
+
+
+@pytest.mark.parametrize('function, paths', [
+    (sin(x)**3 * cos(x)**2, [[0, 0], [0, 1], [0, 2]]),
+    (x * exp(x**2), [[0, 0], [0, 1]]),
+    (sin(x) * cos(x), [[0, 0], [0, 1]]),
+    (exp(x) * sin(x) * cos(x), []),
+])
+def test_lazy(function, paths):
+    steps = intsteps.print_json_steps(function, x, lazy=True)
+    assert stubs(steps) == paths
+    assert expand(steps, function) == intsteps.print_json_steps(function, x)
+
+
+def test_nested_stub():
+    function = 1 / (x * (x + 1))
+    assert stubs(intsteps.print_json_steps(function, x, lazy=True)) == [[0, 0], [0, 1], [0, 2], [0, 3]]
+    assert stubs(intsteps.print_json_substeps(function, x, [0, 2])) == [[0, 2, 0, 0], [0, 2, 0, 1], [0, 2, 0, 2]]
+
+
+def test_card_parameters():
+    lazy = eval_card('intsteps', 'x*exp(x**2)', 'x', {'lazy': True})
+    assert stubs(lazy) == [[0, 0], [0, 1]]
+    method = eval_card('intsteps', 'x*exp(x**2)', 'x', {'path': [0, 1]})
+    assert method['content'] == intsteps.print_json_substeps(x * exp(x**2), x, [0, 1])['content']
+
+
+@pytest.mark.parametrize('function, nodes', [
+    (1 / (x * (x + 1)), 3),
+    (sin(x)**7 * cos(x)**6, 10),
+    (tan(x)**5 * sec(x)**3, 10),
+])
+def test_budget(function, nodes):
+    with intsteps.budgeted(Budget(nodes)) as budget:
+        rule = intsteps.integral_steps(function, x)
+    assert manualintegrate.integral_steps is intsteps.integral_steps
+    assert budget.spent < 2 * nodes
+    assert not intsteps.contains_dont_know(rule)
+    assert simplify(intsteps._manualintegrate(rule).diff(x) - function) == 0
+
+
+def test_cache():
+    # the deadline depends on the machine, so a tree it cut short is not kept, unlike one the nodes cut short
+    intsteps.cached_integral_steps(x**2, x, seconds=0)
+    assert (x**2, x, intsteps.INTSTEPS_NODES, 0) not in intsteps._rules
+    rule = intsteps.cached_integral_steps(x**2, x, nodes=0)
+    assert intsteps.cached_integral_steps(x**2, x, nodes=0) is rule
@@ -0,0 +1,23 @@
+from sympy import Float, Integer, Symbol, sin
+
+from api import eval_card, get_latex_cache_stats
+from gamma.utils import latex, latex_cache
+
+x = Symbol('x')
+
+
+def test_hit():
+    with latex_cache() as cache:
+        assert latex(sin(x)) == latex(sin(x)) == R'\sin{\left(x \right)}'
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'hit_rate': 0.5}
+
+
+def test_equal_but_printed_differently():
+    with latex_cache():
+        assert latex(Integer(1)) == '1'
+        assert latex(Float(1)) == '1.0'
+
+
+def test_request_scope():
+    eval_card('intsteps', 'integrate(exp(x)*sin(x))', 'x', None)
+    assert get_latex_cache_stats()['hits'] > 0
@@ -0,0 +1,33 @@
+import pytest
+from sympy import Integer
+
+from api import eval_card
+from gamma.utils import count_digits, int_to_str, latex, leading_digits, shorten_integer, trailing_digits
+
+# above SMALL_INTEGER_BITS, below the int to str conversion limit
+numbers = [3 ** 7000, -(7 ** 3600), 10 ** 4000, 10 ** 4000 - 1, 12345678901234567890 * 10 ** 3500 + 1,
+           12345678901234567890 * 10 ** 3500 - 1]
+
+
+@pytest.mark.parametrize('n', numbers)
+def test_digits(n: int):
+    s = str(abs(n))
+    assert count_digits(n) == len(s)
+    assert leading_digits(n, 20) == int(s[:20])
+    assert trailing_digits(n, 21) == s[-21:]
+    assert int_to_str(n) == str(n)
+    assert shorten_integer(n) == str(n)[:-len(s) + 20] + '...' + s[-21:]
+
+
+@pytest.mark.parametrize('card_name, expression, expected', [
+    ('digits', '2**10000000', {'type': 'Tex', 'tex': '3010300'}),
+    ('digits', 'factorial(200000)', {'type': 'Tex', 'tex': '973351'}),
+    ('factorization', '2**10000000', {'type': 'Table', 'titles': ('Factor', 'Times'), 'rows': [['2', '10000000']]}),
+])
+def test_card(card_name: str, expression: str, expected: dict):
+    assert eval_card(card_name, expression, None, None) == expected
+
+
+def test_latex():
+    assert latex(Integer(2) ** 10000000) == R'90498173063608003013\ldots 732662370891387109376'
+    assert latex(Integer(2) ** 20000) == int_to_str(2 ** 20000)
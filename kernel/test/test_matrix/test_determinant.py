@@ -0,0 +1,15 @@
+import pytest
+
+from api import eval_card
+
+
+@pytest.mark.parametrize('matrix, expected', [
+    ('Matrix([[1, 2], [3, 4]])', '-2'),
+    ('Matrix([[1/2, 1/3], [1/4, 1/5]])', R'\frac{1}{60}'),
+    ('Matrix([[0, 1, 2], [1, 2, 3], [2, 3, 4]])', '0'),
+    ('Matrix([[0, 2], [3, 0]])', '-6'),
+    ('Matrix([[1.5, 2], [3, 5]])', '1.5'),
+    ('Matrix([[x, 1], [1, x]])', 'x^{2} - 1'),
+])
+def test_card(matrix: str, expected: str):
+    assert eval_card('determinant', matrix, None, None)['tex'] == expected
@@ -0,0 +1,14 @@
+import pytest
+
+from api import eval_card
+
+
+@pytest.mark.parametrize('matrix, expected', [
+    ('Matrix([[1, 2, 3], [2, 4, 6]])', '1'),
+    ('Matrix([[1, 2, 3], [3, 4, 5], [5, 6, 7]])', '2'),
+    ('Matrix([[0, 0], [0, 0]])', '0'),
+    ('Matrix([[0.1, 0.2], [0.3, 0.6]])', '1'),
+    ('Matrix([[1, 2], [3, 4.5]])', '2'),
+])
+def test_card(matrix: str, expected: str):
+    assert eval_card('rank', matrix, None, None)['tex'] == expected
@@ -0,0 +1,13 @@
+import pytest
+
+from api import eval_card
+
+
+@pytest.mark.parametrize('matrix, expected', [
+    ('Matrix([[1, 2, 3], [3, 4, 5]])', R'\left[\begin{matrix}1 & 0 & -1\\0 & 1 & 2\end{matrix}\right]'),
+    ('Matrix([[0, 2, 4], [0, 1, 2], [1, 1/2, 0]])',
+     R'\left[\begin{matrix}1 & 0 & -1\\0 & 1 & 2\\0 & 0 & 0\end{matrix}\right]'),
+    ('Matrix([[2.0, 4], [1, 2]])', R'\left[\begin{matrix}1.0 & 2.0\\0 & 0\end{matrix}\right]'),
+])
+def test_card(matrix: str, expected: str):
+    assert eval_card('rref', matrix, None, None)['tex'] == expected
@@ -0,0 +1,59 @@
+import random
+
+import pytest
+from sympy import Matrix, Rational, eye
+from sympy.matrices.common import NonInvertibleMatrixError
+
+from extension.matrix.util import EXACT_EIGEN_SIZE, echelon, eigenvals, eigenvects, inverse
+
+
+def random_matrix(rng: random.Random) -> Matrix:
+    m, n = rng.randint(1, 6), rng.randint(1, 6)
+    rank = rng.randint(1, min(m, n))
+    # a product of thin factors to get every rank
+    return Matrix(m, rank, lambda i, j: rng.randint(-5, 5)) \
+        * Matrix(rank, n, lambda i, j: Rational(rng.randint(-5, 5), rng.randint(1, 4)))
+
+
+def test_exact():
+    rng = random.Random(0)
+    for _ in range(100):
+        M = random_matrix(rng)
+        result = echelon(M)
+        assert (result.rref, result.pivots) == M.rref()
+        if M.is_square:
+            assert result.det == M.det()
+            if result.det:
+                assert inverse(M) == M.inv()
+
+
+@pytest.mark.parametrize('matrix', [
+    Matrix([[1, 2], [2, 4]]),
+    Matrix([[1.5, 2], [3, 4]]),
+    Matrix([[1, 2 * 1j], [-1j, 2]]),
+])
+def test_inverse_singular(matrix: Matrix):
+    with pytest.raises(NonInvertibleMatrixError):
+        inverse(matrix)
+
+
+@pytest.mark.parametrize('matrix, expected', [
+    (Matrix([[2, 1], [1, 2]]), {1: 1, 3: 1}),
+    (Matrix([[0, -1], [1, 0]]), {-1j: 1, 1j: 1}),
+    (Matrix([[1.0, 1], [0, 1]]), {1: 2}),
+    (eye(EXACT_EIGEN_SIZE + 1) * 2, {2: EXACT_EIGEN_SIZE + 1}),
+])
+def test_eigenvals(matrix: Matrix, expected: dict):
+    actual = {complex(value): multiplicity for value, multiplicity in eigenvals(matrix).items()}
+    assert len(actual) == len(expected)
+    for value, multiplicity in expected.items():
+        close = [v for v in actual if abs(v - value) < 1e-9]
+        assert len(close) == 1 and actual[close[0]] == multiplicity
+
+
+def test_eigenvects():
+    M = Matrix(EXACT_EIGEN_SIZE + 1, EXACT_EIGEN_SIZE + 1, lambda i, j: (i * j + 3 * i + 1) % 7)
+    for value, multiplicity, vectors in eigenvects(M):
+        assert len(vectors) == multiplicity
+        for v in vectors:
+            assert (M * v - value * v).norm() < 1e-9
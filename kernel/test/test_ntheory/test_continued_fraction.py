@@ -1,6 +1,7 @@
 import pytest
 
 from api import eval_card
+from extension.ntheory.continued_fraction import MAX_TERMS, TERMS
 
 cases = [
     ('1.2', (1, [5], [])),
@@ -8,6 +9,12 @@ cases = [
     ('1+sqrt(3)', (2, [], [1, 2])),
     ('pi', (3, [7, 15, 1, 292, 1, 1, 1, 2, 1], None)),
     ('e', (2, [1, 2, 1, 1, 4, 1, 1, 6, 1], None)),
+    ('22/7', (3, [7], [])),
+    ('1.4142135623731', (1, [2] * 18 + [1, 3], [])),
+    ('1/(1+sqrt(2))', (0, [], [2])),
+    ('(3-sqrt(11))/7', (-1, [1, 21], [9, 4, 9, 23])),
+    ('sqrt(94)', (9, [], [1, 2, 3, 1, 1, 5, 1, 8, 1, 5, 1, 1, 3, 2, 1, 18])),
+    ('exp(pi*sqrt(163))', (262537412640768743, [1, 1333462407511, 1, 8, 1, 1, 5, 1, 4], None)),
 ]
 
 
@@ -18,3 +25,25 @@ def test(num: str, expected: tuple[int, list[int], list[int] | None]):
     assert actual['n'] == n
     assert actual['finite'] == finite
     assert actual['repeated'] == repeated
+
+
+def test_terms():
+    actual = eval_card('continued_fraction', 'pi', None, {'terms': 21})
+    assert actual['finite'] == [7, 15, 1, 292, 1, 1, 1, 2, 1, 3, 1, 14, 2, 1, 1, 2, 2, 2, 2, 1]
+    assert actual['repeated'] is None
+
+
+def test_terms_bounds():
+    assert eval_card('continued_fraction', 'pi', None, {'terms': '3'})['finite'] == [7, 15]
+    assert eval_card('continued_fraction', 'pi', None, {'terms': -5})['finite'] == []
+    actual = eval_card('continued_fraction', 'pi', None, {'terms': 10 ** 9})
+    assert len(actual['finite']) == MAX_TERMS - 1
+
+
+def test_truncated():
+    # consecutive Fibonacci numbers, [1; 1, 1, ..., 2] with more than MAX_TERMS terms
+    actual = eval_card('continued_fraction', f'fibonacci({MAX_TERMS + 10})/fibonacci({MAX_TERMS + 9})', None, None)
+    assert actual['finite'] == [1] * (TERMS - 1)
+    assert actual['repeated'] == []
+    assert actual['truncated']
+    assert not eval_card('continued_fraction', '22/7', None, None)['truncated']
@@ -30,3 +30,41 @@ card_cases = [
 def test_card(n: int, expected: str):
     actual = eval_card('is_prime', f'isprime({n})', None, None)['tex']
     assert actual == expected
+
+
+step_cases = [
+    (1000003, R'1000002=2^{1}\times500001\\\\\\'
+              R'\text{Testing bases }2, 3\text{ suffices for }1000003<1373653\\\\\\'
+              R'2^{500001}\equiv-1\pmod{1000003}\\\\\\'
+              R'3^{500001}\equiv-1\pmod{1000003}\\\\\\'
+              R'\text{So }1000003\text{ is prime}'),
+    (1000033, R'1000032=2^{5}\times31251\\\\\\'
+              R'\text{Testing bases }2, 3\text{ suffices for }1000033<1373653\\\\\\'
+              R'2^{2^{2}\times31251}\equiv-1\pmod{1000033}\\\\\\'
+              R'3^{2^{1}\times31251}\equiv-1\pmod{1000033}\\\\\\'
+              R'\text{So }1000033\text{ is prime}'),
+    (25326001, R'25326000=2^{4}\times1582875\\\\\\'
+               R'\text{Testing bases }2, 3, 5, 7\text{ suffices for }25326001<3215031751\\\\\\'
+               R'2^{1582875}\equiv-1\pmod{25326001}\\\\\\'
+               R'3^{1582875}\equiv-1\pmod{25326001}\\\\\\'
+               R'5^{1582875}\equiv1\pmod{25326001}\\\\\\'
+               R'7^{1582875}\equiv19453141\pmod{25326001}\text{ and no }7^{2^r\times1582875}\text{ with }r<4'
+               R'\text{ is }\equiv-1\text{, so }7\text{ is a witness that }25326001\text{ is composite}'),
+]
+
+
+@pytest.mark.parametrize('n, expected', step_cases)
+def test_miller_rabin(n: int, expected: str):
+    actual = eval_card('is_prime', f'isprime({n})', None, None)['tex']
+    assert actual == expected
+
+
+@pytest.mark.parametrize('n, prime', [
+    (2**89 - 1, True),
+    (10**100 + 267, True),
+    ((10**50 + 151) * (10**100 + 267), False),
+])
+def test_baillie_psw(n: int, prime: bool):
+    actual = eval_card('is_prime', f'isprime({n})', None, None)['tex']
+    assert actual.count(R'\\\\\\') <= 5
+    assert actual.endswith(R'\text{ passes the Baillie-PSW test, which no known composite number passes}') == prime
@@ -12,3 +12,28 @@ cases = [
 def test(n: int, expected: str):
     actual = eval_card('primitive_root', str(n), None, None)['text']
     assert actual == expected
+
+
+page_cases = [
+    (43, {'offset': 4, 'limit': 3}, '..., 19, 20, 26, ... (12 primitive roots in total)'),
+    (1000000007, {'limit': 5}, '5, 10, 13, 15, 17, ... (500000002 primitive roots in total)'),
+    (999999999989, {'offset': 10, 'limit': 5}, '..., 27, 31, 32, 33, 34, ... (454539316800 primitive roots in total)'),
+    (2 * 3**20, None, '5, 11, 23, 29, 41, 47, 59, 65, 77, 83, 95, 101, 113, 119, 131, 137, 149, 155, 167, 173, 185, '
+                      '191, 203, 209, 221, 227, 239, 245, 257, 263, 275, 281, 293, 299, 311, 317, 329, 335, 347, 353, '
+                      '365, 371, 383, 389, 401, 407, 419, 425, 437, 443, ... (774840978 primitive roots in total)'),
+    (10**12, None, "1000000000000 doesn't have primitive root"),
+    # the limit is capped at a page
+    (999999999989, {'limit': 10**12},
+     '2, 3, 8, 10, 14, 18, 19, 21, 22, 26, 27, 31, 32, 33, 34, 39, 40, 41, 46, 48, 50, 51, 53, 56, 58, 59, 60, 67, '
+     '69, 70, 71, 72, 74, 75, 84, 87, 88, 90, 94, 97, 98, 101, 104, 105, 107, 108, 109, 110, 111, 113, '
+     '... (454539316800 primitive roots in total)'),
+    (999999999989, {'offset': 10**6, 'limit': 5},
+     'Primitive roots from offset 1000000 are not reached in time (454539316800 primitive roots in total)'),
+    (43, {'offset': 20}, 'No primitive root from offset 20, 43 has 12 primitive roots'),
+]
+
+
+@pytest.mark.parametrize('n, parameters, expected', page_cases)
+def test_page(n: int, parameters, expected: str):
+    actual = eval_card('primitive_root', str(n), None, parameters)['text']
+    assert actual == expected
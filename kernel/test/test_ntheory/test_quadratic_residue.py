@@ -1,5 +1,29 @@
+import pytest
+
 from api import eval_card
+from extension.ntheory.quadratic_residue import PAGE_SIZE
 
 
 def test():
     assert eval_card('quadratic_residue', '7', None, None) == {'type': 'Text', 'text': '0, 1, 2, 4'}
+
+
+page_cases = [
+    (7, {'offset': 1, 'limit': 2}, '..., 1, 2, ... (4 quadratic residues in total, density 0.5714)'),
+    (9999991, {'offset': 100, 'limit': 5},
+     '..., 199, 200, 201, 202, 203, ... (4999996 quadratic residues in total, density 0.5)'),
+    (10**7, {'offset': 100, 'limit': 5},
+     '..., 1249, 1281, 1284, 1289, 1296, ... (748719 quadratic residues in total, density 0.07487)'),
+    (7, {'offset': 10}, 'No quadratic residue from offset 10, 7 has 4 quadratic residues'),
+]
+
+
+@pytest.mark.parametrize('n, parameters, expected', page_cases)
+def test_page(n: int, parameters, expected: str):
+    assert eval_card('quadratic_residue', str(n), None, parameters)['text'] == expected
+
+
+def test_limit():
+    # the limit is capped at a page
+    assert eval_card('quadratic_residue', '9999991', None, {'offset': 100, 'limit': 10**9}) \
+        == eval_card('quadratic_residue', '9999991', None, {'offset': 100, 'limit': PAGE_SIZE})
@@ -0,0 +1,37 @@
+import pytest
+from sympy import isprime, primefactors, primerange
+
+from extension.ntheory.util import Sieve
+
+
+def test_primes_upto():
+    sieve = Sieve()
+    for n in [0, 1, 2, 3, 100, 1000]:
+        assert sieve.primes_upto(n).tolist() == list(primerange(n + 1))
+    assert sieve.primes_upto(10**6).tolist() == list(primerange(10**6 + 1))
+
+
+def test_queries():
+    sieve = Sieve()
+    for n in range(2, 2000):
+        assert sieve.is_small_prime(n) == isprime(n)
+        assert sieve.smallest_factor(n) == min(primefactors(n))
+    assert sieve.smallest_factor(999983 * 1000003) == 999983
+    assert sieve.smallest_factor(65537**2) == 65537
+
+
+def test_load(tmp_path):
+    path = tmp_path / 'sieve.npy'
+    sieve = Sieve()
+    sieve.extend(10**5)
+    sieve.save(str(path))
+    loaded = Sieve.load(str(path))
+    assert loaded.limit == sieve.limit
+    assert loaded.is_small_prime(99991)
+    # growing past the file copies the flags into memory
+    assert loaded.primes_upto(3 * 10**5).tolist() == list(primerange(3 * 10**5 + 1))
+
+
+def test_max_bytes():
+    with pytest.raises(ValueError):
+        Sieve(max_bytes=1000).extend(10**5)
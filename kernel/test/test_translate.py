@@ -1,6 +1,8 @@
 import pytest
 
 from nlp import translate
+from nlp.dispatcher import dispatch
+from nlp.parser import plausible, rank
 
 corner_cases = [
     (' is  2 even ', '(2).is_even'),  # extra space
@@ -41,3 +43,38 @@ cases = corner_cases \
 def test(nl: str, expected: str):
     actual = translate(nl)
     assert actual == expected
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('x', True),
+    ('f(x)[0]', True),
+    (' ', False),
+    ('(x', False),
+    ('x)', False),
+    ('(x]', False),
+])
+def test_plausible(text: str, expected: bool):
+    assert plausible(text) == expected
+
+
+@pytest.mark.parametrize('nl, max_evaluations, expected', [
+    ('is 6 a multiple of 3', 2, '(6) % (3) == 0'),
+    ('is 6 a multiple of 3', 1, None),
+    ('factorize 12', 1, 'factorint(12)'),
+    ('factorize x**2-1', 1, 'factor(x**2-1)'),  # the group is evaluated once for both patterns
+])
+def test_max_evaluations(nl: str, max_evaluations: int, expected: str | None):
+    if expected is None:
+        with pytest.raises(ValueError):
+            translate(nl, max_evaluations)
+    else:
+        assert translate(nl, max_evaluations) == expected
+
+
+def test_rank():
+    nl = 'integrate x for y'
+    candidates = [(entry, match) for entry in dispatch(nl.split()) if (match := entry[3].fullmatch(nl))]
+    # independent of the pattern order
+    candidates.reverse()
+    candidates.sort(key=lambda candidate: rank(*candidate))
+    assert [entry[0] for entry, _ in candidates] == [R'integrate \expr for \expr', R'integrate \expr']
@@ -129,6 +129,7 @@ declare global {
     n: number
     finite: number[]
     repeated: number[] | undefined
+    truncated: boolean
   }
   type MultiResultContent = {
     results: {